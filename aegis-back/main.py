@@ -9,15 +9,24 @@ Validates: Requirements 7.1, 7.2, 7.3, 7.4, 7.5
 """
 
 import os
+import sys
+import uuid
+import hashlib
 import logging
 import asyncio
-from typing import Optional
-from datetime import datetime
+import importlib.util
+from contextlib import aclosing, asynccontextmanager
+from functools import lru_cache
+from typing import List, Optional, Set
+from datetime import datetime, timezone
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, status, Request
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, status, Request, Response, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+import PIL
 import uvicorn
+from uvicorn.supervisors import ChangeReload
 
 from src.models import (
     TaskInstructionRequest,
@@ -25,8 +34,10 @@ from src.models import (
     HistoryResponse,
     ErrorResponse,
     ExecutionSession,
+    ExecutionPlan,
     SessionSummary,
-    StatusUpdate
+    StatusUpdate,
+    TERMINAL_STATUSES
 )
 from src.preprocessing import PreProcessor
 from src.plan_cache import PlanCache
@@ -37,10 +48,12 @@ from src.websocket_manager import WebSocketManager
 from src.exceptions import (
     AEGISException,
     ValidationError,
+    InstructionValidationError,
     ClientError,
     SystemError,
     SessionNotFoundError,
-    InvalidSessionStateError
+    InvalidSessionStateError,
+    QueueFullError
 )
 from src.logging_utils import setup_logging, get_session_logger, set_session_context, clear_session_context
 from src.resource_manager import ResourceManager
@@ -57,35 +70,283 @@ setup_logging(
 )
 logger = get_session_logger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Manage the application lifecycle.
+    
+    Startup builds the services concurrently and starts the execution queue
+    processor and plan cache flusher; shutdown
+    stops them, records queued sessions as cancelled, closes WebSocket
+    connections and writes pending cached plans.
+    """
+    global execution_tasks
+    
+    logger.info("🚀 AEGIS RPA Backend starting up...")
+    
+    try:
+        # Log configuration summary
+        config_summary = config.get_summary()
+        logger.info("Configuration loaded: %s", config_summary)
+        
+        # Screen comparison runs in Pillow's C routines; pillow-simd builds
+        # report a ".postN" version, which confirms the SIMD wheel is active
+        logger.info("Imaging library: Pillow %s", PIL.__version__)
+        
+        # Each worker process would get its own queue and sessions, so
+        # tasks queued in one would be invisible to the others
+        if os.environ.get("WEB_CONCURRENCY", "1").strip() not in ("", "1"):
+            logger.warning(
+                "WEB_CONCURRENCY=%s requested, but AEGIS keeps its execution queue "
+                "in-process; run a single worker and raise MAX_CONCURRENT_SESSIONS instead",
+                os.environ["WEB_CONCURRENCY"]
+            )
+        
+        # Construct independent services concurrently; the disk-backed stores
+        # load in parallel, and the ADK model is set up on first use
+        await asyncio.gather(
+            asyncio.to_thread(get_preprocessor),
+            asyncio.to_thread(get_plan_cache),
+            asyncio.to_thread(get_adk_agent),
+            asyncio.to_thread(get_session_manager),
+            asyncio.to_thread(get_history_store),
+            asyncio.to_thread(get_websocket_manager)
+        )
+        logger.info("✓ Services initialized")
+        
+        # Start the execution queue workers; desktop actions are still
+        # serialized inside the ADK agent
+        execution_tasks = [
+            asyncio.create_task(process_execution_queue())
+            for _ in range(config.MAX_CONCURRENT_SESSIONS)
+        ]
+        logger.info("✓ %d execution queue worker(s) started", len(execution_tasks))
+        
+        # Persist new cached plans in the background, off the execution path
+        flusher_task = asyncio.create_task(
+            get_plan_cache().run_flusher(config.PLAN_CACHE_FLUSH_INTERVAL)
+        )
+        
+        logger.info("🎉 AEGIS RPA Backend startup complete!")
+        
+    except Exception as e:
+        logger.error("❌ Failed to start AEGIS RPA Backend: %s", e)
+        raise
+    
+    yield
+    
+    logger.info("🛑 AEGIS RPA Backend shutting down...")
+    
+    session_manager = get_session_manager()
+    history_store = get_history_store()
+    websocket_manager = get_websocket_manager()
+    
+    try:
+        flusher_task.cancel()
+        
+        # Cancel the execution queue workers
+        for task in execution_tasks:
+            task.cancel()
+        await asyncio.gather(*execution_tasks, return_exceptions=True)
+
+        # Record sessions still waiting in the queue as cancelled so they
+        # show up in history instead of disappearing with the process
+        while not request_queue.empty():
+            pending_id = request_queue.get_nowait()
+            request_queue.task_done()
+            if session_manager.cancel_session(pending_id):
+                save_session_in_background(history_store, session_manager.get_session(pending_id))
+                logger.info("Pending session %s cancelled on shutdown", pending_id)
+        
+        # Let history saves finish writing, but do not hold shutdown hostage
+        # to a stalled disk
+        if pending_saves:
+            _, unfinished = await asyncio.wait(set(pending_saves), timeout=SHUTDOWN_SAVE_TIMEOUT)
+            if unfinished:
+                logger.warning("%d history save(s) still running at shutdown", len(unfinished))
+
+        # Close all WebSocket connections concurrently
+        await websocket_manager.close_all()
+        
+        # Write any plans stored since the last background flush
+        await asyncio.to_thread(get_plan_cache().flush)
+        
+        logger.info("✓ Cleanup complete")
+        
+    except Exception as e:
+        logger.error("Error during shutdown: %s", e)
+
+
 # Initialize FastAPI application
 app = FastAPI(
     title="AEGIS RPA Backend",
     description="Cognitive, intent-driven RPA automation engine powered by Google ADK and Gemini",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# Configure CORS for frontend communication
+# Configure CORS for frontend communication; set CORS_ORIGINS to the
+# frontend's origin(s) in production. The client sends no cookies or auth
+# headers, so credentials stay off and a wildcard origin is answered with a
+# static "*" instead of echoing each request's Origin
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
-    allow_methods=["*"],
+    allow_origins=config.CORS_ORIGINS,
+    allow_methods=["GET", "POST", "DELETE"],
     allow_headers=["*"],
 )
 
-# Global service instances
-preprocessor: Optional[PreProcessor] = None
-plan_cache: Optional[PlanCache] = None
-adk_agent: Optional[ADKAgentManager] = None
-session_manager: Optional[SessionManager] = None
-history_store: Optional[HistoryStore] = None
-websocket_manager: Optional[WebSocketManager] = None
+# Compress larger JSON payloads such as /api/history and session details
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+
+
+# Distinguishes this process's history ETags from those of earlier runs,
+# whose HistoryStore version counters started from the same value
+_BOOT_ID = uuid.uuid4().hex
+
+# Seconds shutdown waits for outstanding history saves
+SHUTDOWN_SAVE_TIMEOUT = 5.0
+
+# Upper bound on one history listing, so a single request cannot
+# materialize the whole store
+MAX_HISTORY_LIMIT = 500
+
+# Short client-side freshness for history listings; pollers revalidate with the ETag
+HISTORY_CACHE_CONTROL = "private, max-age=1"
+
+# Serializes history listing rebuilds so a burst of polls after a save scans
+# the store once; the rest are served from HistoryStore's listing cache
+history_refresh_lock = asyncio.Lock()
+
+
+async def load_history_session(history_store: HistoryStore, session_id: str) -> Optional[ExecutionSession]:
+    """
+    Fetch a finished session from the history store.
+    
+    Sessions the store has already parsed are returned directly; only a
+    cache miss pays for a worker thread to read the file.
+    
+    Args:
+        history_store: Store to read from
+        session_id: Unique session identifier
+    
+    Returns:
+        ExecutionSession if found, None otherwise
+    """
+    session = history_store.get_cached_session_details(session_id)
+    if session is None:
+        session = await asyncio.to_thread(history_store.get_session_details, session_id)
+    return session
+
+
+def is_replayable_plan(plan: Optional[ExecutionPlan], instruction: str) -> bool:
+    """
+    Decide whether a cached plan may be replayed for an instruction.
+    
+    The plan cache matches on similarity, but a replay repeats the stored
+    tool arguments verbatim, so instructions differing only in a number or
+    in letter case would type the old values. Only a plan stored for the
+    exact same instruction is replayed.
+    
+    Args:
+        plan: Plan returned by the plan cache, if any
+        instruction: Instruction of the session being executed
+    
+    Returns:
+        True if the plan was stored for exactly this instruction
+    """
+    return plan is not None and plan.instruction == instruction
+
+
+def history_etag(version: int, limit: int) -> str:
+    """
+    Build the ETag for a history listing.
+    
+    Args:
+        version: HistoryStore version the listing was read at
+        limit: Maximum number of sessions requested
+    
+    Returns:
+        Quoted strong ETag value
+    """
+    digest = hashlib.blake2b(
+        f"{_BOOT_ID}:{version}:{limit}".encode(), digest_size=8
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+# Service providers: each service is created once on first use and shared
+# by the endpoints (via Depends), the execution queue processor and shutdown
+@lru_cache
+def get_preprocessor() -> PreProcessor:
+    """Return the shared PreProcessor instance."""
+    return PreProcessor()
+
+
+@lru_cache
+def get_plan_cache() -> PlanCache:
+    """Return the shared PlanCache instance."""
+    return PlanCache()
+
+
+@lru_cache
+def get_adk_agent() -> ADKAgentManager:
+    """Return the shared ADKAgentManager instance."""
+    return ADKAgentManager()
+
+
+@lru_cache
+def get_session_manager() -> SessionManager:
+    """Return the shared SessionManager instance."""
+    return SessionManager()
+
+
+@lru_cache
+def get_history_store() -> HistoryStore:
+    """Return the shared HistoryStore instance."""
+    return HistoryStore()
+
+
+@lru_cache
+def get_websocket_manager() -> WebSocketManager:
+    """Return the shared WebSocketManager instance."""
+    return WebSocketManager()
+
 
-# Request queue for sequential processing
-request_queue: asyncio.Queue = asyncio.Queue()
-execution_task: Optional[asyncio.Task] = None
+# Request queue shared by the execution workers, bounded so bursts are rejected
+# instead of buffered without limit
+request_queue: asyncio.Queue = asyncio.Queue(maxsize=config.REQUEST_QUEUE_SIZE)
+execution_tasks: List[asyncio.Task] = []
+
+# History saves running in the background; held here so they are not
+# garbage collected mid-write, and awaited on shutdown
+pending_saves: Set[asyncio.Task] = set()
+
+
+async def save_session_to_history(history_store: HistoryStore, session: ExecutionSession) -> None:
+    """Write a finished session to history, logging instead of raising on failure."""
+    try:
+        await asyncio.to_thread(history_store.save_session, session)
+        logger.info("Session %s saved to history with status: %s", session.session_id, session.status)
+    except Exception as e:
+        logger.error("Failed to save session %s to history: %s", session.session_id, e, exc_info=True)
+
+
+def save_session_in_background(history_store: HistoryStore, session: ExecutionSession) -> None:
+    """
+    Schedule a history save without waiting for the disk write.
+    
+    Args:
+        history_store: Store to write to
+        session: Finished session to persist
+    """
+    task = asyncio.create_task(save_session_to_history(history_store, session))
+    pending_saves.add(task)
+    task.add_done_callback(pending_saves.discard)
 
 
 @app.get("/")
@@ -99,7 +360,11 @@ async def root():
 
 
 @app.post("/api/start_task", response_model=TaskInstructionResponse, status_code=status.HTTP_200_OK)
-async def start_task(request: TaskInstructionRequest):
+async def start_task(
+    request: TaskInstructionRequest,
+    preprocessor: PreProcessor = Depends(get_preprocessor),
+    session_manager: SessionManager = Depends(get_session_manager)
+):
     """
     Submit a new task instruction for execution.
     
@@ -114,57 +379,71 @@ async def start_task(request: TaskInstructionRequest):
     
     Raises:
         ValidationError: If instruction validation fails
+        QueueFullError: If the execution queue is full (HTTP 429)
         SystemError: If session creation fails
     
     Validates: Requirement 7.1, 9.2, 9.3
     """
     try:
-        logger.info(f"Received task instruction: {request.instruction}")
+        logger.debug("Received task instruction: %s", request.instruction)
         
         # Pre-process and validate instruction
         validation_result, sanitized_instruction = preprocessor.validate_and_sanitize(request.instruction)
         
         if not validation_result.is_valid:
-            logger.warning(f"Instruction validation failed: {validation_result.error_message}")
-            from src.exceptions import InstructionValidationError
+            logger.warning("Instruction validation failed: %s", validation_result.error_message)
             raise InstructionValidationError(
                 message="Task instruction validation failed",
                 details=validation_result.error_message
             )
         
+        # Refuse new work before creating a session if the queue is full
+        if request_queue.full():
+            raise QueueFullError(queue_size=request_queue.maxsize)
+        
         # Create execution session
         session_id = session_manager.create_session(sanitized_instruction)
-        logger.info(f"Created session {session_id} for instruction: {sanitized_instruction}")
+        logger.debug("Created session %s for instruction: %s", session_id, sanitized_instruction)
         
         # Queue the session for execution
-        await request_queue.put(session_id)
+        request_queue.put_nowait(session_id)
         
-        return TaskInstructionResponse(
+        # Serialize once with pydantic-core instead of the response_model pass
+        response = TaskInstructionResponse(
             session_id=session_id,
             status="pending",
-            message="Task queued for execution"
+            message="Task queued for execution",
+            queue_position=request_queue.qsize()
         )
+        return Response(content=response.model_dump_json(), media_type="application/json")
         
-    except ValidationError:
+    except (ValidationError, QueueFullError):
         raise
     except Exception as e:
-        logger.error(f"Error starting task: {e}", exc_info=True)
-        from src.exceptions import SystemError as AEGISSystemError
-        raise AEGISSystemError(
+        logger.error("Error starting task: %s", e, exc_info=True)
+        raise SystemError(
             message="Failed to start task",
             details=str(e)
         )
 
 
 @app.get("/api/history", response_model=HistoryResponse, status_code=status.HTTP_200_OK)
-async def get_history(limit: int = 100):
+async def get_history(
+    request: Request,
+    limit: int = Query(100, ge=1, le=MAX_HISTORY_LIMIT),
+    history_store: HistoryStore = Depends(get_history_store)
+):
     """
     Retrieve execution history.
     
     Returns a list of all execution sessions ordered by timestamp descending.
+    Responses carry an ETag; a request whose If-None-Match matches the
+    current history gets an empty 304 instead.
     
     Args:
-        limit: Maximum number of sessions to return (default: 100)
+        request: Incoming request (for If-None-Match)
+        limit: Maximum number of sessions to return (default: 100, at most
+            MAX_HISTORY_LIMIT)
     
     Returns:
         HistoryResponse containing list of session summaries
@@ -175,17 +454,35 @@ async def get_history(limit: int = 100):
     Validates: Requirement 7.2
     """
     try:
-        logger.info(f"Retrieving execution history (limit: {limit})")
+        logger.debug("Retrieving execution history (limit: %s)", limit)
+        
+        # Read the version before the sessions so a concurrent save can only
+        # make the ETag stale, never newer than the data it describes
+        etag = history_etag(history_store.version, limit)
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag, "Cache-Control": HISTORY_CACHE_CONTROL}
+            )
         
-        sessions = history_store.get_all_sessions(limit=limit)
+        async with history_refresh_lock:
+            sessions = await asyncio.to_thread(history_store.get_all_sessions, limit=limit)
         
-        return HistoryResponse(
+        # Summaries are already validated models, so skip re-validation and
+        # serialize once with pydantic-core instead of the response_model pass
+        payload = HistoryResponse.model_construct(
             sessions=sessions,
             total=len(sessions)
+        ).model_dump_json()
+        return Response(
+            content=payload,
+            media_type="application/json",
+            headers={"ETag": etag, "Cache-Control": HISTORY_CACHE_CONTROL}
         )
         
     except Exception as e:
-        logger.error(f"Error retrieving history: {e}")
+        logger.error("Error retrieving history: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve history: {str(e)}"
@@ -193,7 +490,11 @@ async def get_history(limit: int = 100):
 
 
 @app.get("/api/history/{session_id}", response_model=ExecutionSession, status_code=status.HTTP_200_OK)
-async def get_session_details(session_id: str):
+async def get_session_details(
+    session_id: str,
+    session_manager: SessionManager = Depends(get_session_manager),
+    history_store: HistoryStore = Depends(get_history_store)
+):
     """
     Retrieve detailed information for a specific execution session.
     
@@ -210,14 +511,14 @@ async def get_session_details(session_id: str):
     Validates: Requirement 7.3
     """
     try:
-        logger.info(f"Retrieving session details for: {session_id}")
+        logger.debug("Retrieving session details for: %s", session_id)
         
         # Try to get from session manager first (for active sessions)
         session = session_manager.get_session(session_id)
         
         # If not in active sessions, try history store
         if not session:
-            session = history_store.get_session_details(session_id)
+            session = await load_history_session(history_store, session_id)
         
         if not session:
             raise SessionNotFoundError(
@@ -225,7 +526,7 @@ async def get_session_details(session_id: str):
                 details="Session not found in active sessions or history"
             )
         
-        return session
+        return Response(content=session.model_dump_json(), media_type="application/json")
         
     except (SessionNotFoundError, InvalidSessionStateError):
         # Let custom exceptions propagate to exception handlers
@@ -233,7 +534,7 @@ async def get_session_details(session_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving session details: {e}")
+        logger.error("Error retrieving session details: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve session details: {str(e)}"
@@ -241,7 +542,12 @@ async def get_session_details(session_id: str):
 
 
 @app.delete("/api/execution/{session_id}", status_code=status.HTTP_200_OK)
-async def cancel_execution(session_id: str):
+async def cancel_execution(
+    session_id: str,
+    session_manager: SessionManager = Depends(get_session_manager),
+    history_store: HistoryStore = Depends(get_history_store),
+    websocket_manager: WebSocketManager = Depends(get_websocket_manager)
+):
     """
     Cancel an ongoing execution session.
     
@@ -262,14 +568,14 @@ async def cancel_execution(session_id: str):
     Validates: Requirements 7.4, 8.5, 13.4
     """
     try:
-        logger.info(f"Cancelling execution for session: {session_id}")
+        logger.info("Cancelling execution for session: %s", session_id)
         
         # Get session to check status
         session = session_manager.get_session(session_id)
         
         if not session:
             # Check history store for completed sessions
-            session = history_store.get_session_details(session_id)
+            session = await load_history_session(history_store, session_id)
             if session:
                 raise InvalidSessionStateError(
                     session_id=session_id,
@@ -280,7 +586,7 @@ async def cancel_execution(session_id: str):
             raise SessionNotFoundError(session_id=session_id)
         
         # Check if session can be cancelled
-        if session.status in ["completed", "failed", "cancelled"]:
+        if session.status in TERMINAL_STATUSES:
             raise InvalidSessionStateError(
                 session_id=session_id,
                 current_state=session.status,
@@ -297,27 +603,30 @@ async def cancel_execution(session_id: str):
                 detail="Failed to cancel session"
             )
         
+        # One timestamp for the update and the session's final state
+        now = datetime.now(timezone.utc)
+        
         # Send cancellation status update with window restore
-        cancel_update = StatusUpdate(
+        cancel_update = StatusUpdate.model_construct(
             session_id=session_id,
             subtask=None,
             overall_status="cancelled",
             message="Execution cancelled by user",
             window_state="normal",
-            timestamp=datetime.now()
+            timestamp=now
         )
         await websocket_manager.broadcast_update(session_id, cancel_update)
         
         # Update session in manager
         session.status = "cancelled"
-        session.completed_at = datetime.now()
-        session.updated_at = datetime.now()
+        session.completed_at = now
+        session.updated_at = now
         session_manager.update_session(session_id, None)
         
         # Save to history
-        history_store.save_session(session)
+        await asyncio.to_thread(history_store.save_session, session)
         
-        logger.info(f"Session {session_id} cancelled successfully")
+        logger.info("Session %s cancelled successfully", session_id)
         
         return {
             "message": f"Session {session_id} cancelled successfully",
@@ -331,7 +640,7 @@ async def cancel_execution(session_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error cancelling execution: {e}", exc_info=True)
+        logger.error("Error cancelling execution: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to cancel execution: {str(e)}"
@@ -339,7 +648,11 @@ async def cancel_execution(session_id: str):
 
 
 @app.websocket("/ws/execution/{session_id}")
-async def websocket_execution(websocket: WebSocket, session_id: str):
+async def websocket_execution(
+    websocket: WebSocket,
+    session_id: str,
+    websocket_manager: WebSocketManager = Depends(get_websocket_manager)
+):
     """
     WebSocket endpoint for real-time execution status updates.
     
@@ -355,30 +668,28 @@ async def websocket_execution(websocket: WebSocket, session_id: str):
     await websocket_manager.connect(websocket, session_id)
     
     try:
-        # Keep connection alive and listen for client messages
+        # Listen for client messages; keepalive pings are handled by the
+        # server's WebSocket protocol layer
         while True:
-            # Wait for messages from client (e.g., ping/pong)
-            try:
-                data = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
-                logger.debug(f"Received WebSocket message from {session_id}: {data}")
-            except asyncio.TimeoutError:
-                # Send ping to keep connection alive
-                await websocket.send_json({"type": "ping", "timestamp": datetime.now().isoformat()})
+            data = await websocket.receive_text()
+            logger.debug("Received WebSocket message from %s: %s", session_id, data)
             
     except WebSocketDisconnect:
-        logger.info(f"WebSocket disconnected for session: {session_id}")
+        logger.info("WebSocket disconnected for session: %s", session_id)
         await websocket_manager.disconnect(websocket, session_id)
     except Exception as e:
-        logger.error(f"WebSocket error for session {session_id}: {e}")
+        logger.error("WebSocket error for session %s: %s", session_id, e)
         await websocket_manager.disconnect(websocket, session_id)
 
 
 async def process_execution_queue():
     """
-    Background task that processes queued execution requests sequentially.
+    Background worker that processes queued execution requests.
     
-    This ensures that only one task executes at a time, preventing
-    conflicts in desktop automation.
+    MAX_CONCURRENT_SESSIONS workers run this loop. Each worker handles one
+    session at a time; planning can overlap across workers, while the ADK
+    agent's desktop lock keeps tool execution to one session at a time to
+    prevent conflicts in desktop automation.
     
     Integrates: Pre-Processing → Plan Cache → ADK Agent → RPA Engine → Action Observer
     Connects: Session Manager ↔ WebSocket Manager ↔ History Store
@@ -387,161 +698,168 @@ async def process_execution_queue():
     """
     logger.info("Starting execution queue processor")
     
+    plan_cache = get_plan_cache()
+    adk_agent = get_adk_agent()
+    session_manager = get_session_manager()
+    history_store = get_history_store()
+    websocket_manager = get_websocket_manager()
+    
+    # Each worker keeps one resource manager and rebinds it per session
+    resource_manager = None
+    
     while True:
         session_id = None
-        resource_manager = None
         
         try:
             # Wait for next session in queue
             session_id = await request_queue.get()
-            logger.info(f"Processing session from queue: {session_id}", session_id=session_id)
+            logger.info("Processing session from queue: %s", session_id, session_id=session_id)
             
             # Set session context for logging
             token = set_session_context(session_id)
             
-            # Create resource manager for this session
-            resource_manager = ResourceManager(session_id)
+            # Bind the worker's resource manager to this session
+            if resource_manager is None:
+                resource_manager = ResourceManager(session_id)
+            else:
+                resource_manager.reset(session_id)
             
             # Get session from session manager
             session = session_manager.get_session(session_id)
             if not session:
-                logger.error(f"Session {session_id} not found in queue processor", session_id=session_id)
+                logger.error("Session %s not found in queue processor", session_id, session_id=session_id)
                 request_queue.task_done()
                 clear_session_context(token)
                 continue
             
             # Update session status to in_progress
+            now = datetime.now(timezone.utc)
             session.status = "in_progress"
-            session.updated_at = datetime.now()
+            session.updated_at = now
             session_manager.update_session(session_id, None)
             
-            # Send initial status update via WebSocket
-            initial_update = StatusUpdate(
+            # Send initial status update via WebSocket; updates built here
+            # from known-good values skip validation via model_construct
+            initial_update = StatusUpdate.model_construct(
                 session_id=session_id,
                 subtask=None,
                 overall_status="in_progress",
                 message="Starting task execution",
-                timestamp=datetime.now()
+                timestamp=now
             )
             await websocket_manager.broadcast_update(session_id, initial_update)
             
             try:
                 # Step 1: Pre-processing already done in start_task endpoint
+                # The agent is initialized by the first session that needs it
+                await adk_agent.ensure_initialized()
+                
                 # Step 2: Check plan cache for similar instructions
-                cached_plan = plan_cache.get_cached_plan(session.instruction)
+                cached_plan = await asyncio.to_thread(plan_cache.get_cached_plan, session.instruction)
                 
-                if cached_plan:
-                    logger.info(f"Cache hit for session {session_id} - using cached plan")
-                    # Note: For now, we still use ADK agent even with cache hit
-                    # In future, could execute cached plan directly
-                    # This validates Requirement 2.3 (cache lookup performed)
+                replay = is_replayable_plan(cached_plan, session.instruction)
+                if replay:
+                    # Replay the stored tool calls, skipping the planning round-trip
+                    logger.debug("Cache hit for session %s - replaying cached plan", session_id)
+                    execution = adk_agent.execute_plan(cached_plan, session_id)
                 else:
-                    logger.info(f"Cache miss for session {session_id} - generating new plan")
+                    if cached_plan:
+                        logger.debug("Similar cached plan for session %s differs in instruction - re-planning", session_id)
+                    else:
+                        logger.debug("Cache miss for session %s - generating new plan", session_id)
+                    execution = adk_agent.execute_instruction(session.instruction, session_id)
                 
-                # Step 3: Execute instruction using ADK Agent
+                # Step 3: Execute via the ADK agent (planned or replayed)
                 # The ADK agent will orchestrate RPA Engine and Action Observer
                 window_state_sent = False
                 
-                async for status_update in adk_agent.execute_instruction(
-                    session.instruction,
-                    session_id
-                ):
-                    # Update session with status from ADK agent
-                    session_manager.update_session(session_id, status_update)
+                # aclosing releases the agent's desktop lock even when the
+                # loop breaks early on a terminal update
+                async with aclosing(execution) as status_updates:
+                    async for status_update in status_updates:
+                        # Update session with status from ADK agent
+                        session_manager.update_session(session_id, status_update)
                     
-                    # Handle window state management
-                    # Send WINDOW_STATE_MINIMAL before first desktop action
-                    if not window_state_sent and status_update.window_state == "minimal":
-                        logger.info(f"Sending WINDOW_STATE_MINIMAL for session {session_id}")
-                        window_state_sent = True
+                        # Handle window state management
+                        # Send WINDOW_STATE_MINIMAL before first desktop action
+                        if not window_state_sent and status_update.window_state == "minimal":
+                            logger.debug("Sending WINDOW_STATE_MINIMAL for session %s", session_id)
+                            window_state_sent = True
                     
-                    # Broadcast update via WebSocket to frontend
-                    await websocket_manager.broadcast_update(session_id, status_update)
+                        # Broadcast update via WebSocket to frontend
+                        await websocket_manager.broadcast_update(session_id, status_update)
                     
-                    # Check if execution completed or failed
-                    if status_update.overall_status in ["completed", "failed"]:
-                        # Get final session state
-                        final_session = session_manager.get_session(session_id)
-                        if final_session:
-                            # Update completion timestamp
-                            final_session.completed_at = datetime.now()
-                            final_session.updated_at = datetime.now()
-                            
-                            # Save to history store for persistence
-                            history_store.save_session(final_session)
-                            logger.info(f"Session {session_id} saved to history with status: {status_update.overall_status}")
+                        # Check if execution completed or failed
+                        if status_update.overall_status in TERMINAL_STATUSES:
+                            # update_session mutates the managed instance in place,
+                            # so the local session already holds the final state
+                            now = datetime.now(timezone.utc)
+                            session.completed_at = now
+                            session.updated_at = now
                         
-                        # Ensure window is restored to normal
-                        if status_update.window_state != "normal":
-                            restore_update = StatusUpdate(
-                                session_id=session_id,
-                                subtask=None,
-                                overall_status=status_update.overall_status,
-                                message="Restoring window to normal state",
-                                window_state="normal",
-                                timestamp=datetime.now()
-                            )
-                            await websocket_manager.broadcast_update(session_id, restore_update)
-                            logger.info(f"Sent WINDOW_STATE_NORMAL for session {session_id}")
+                            # Persist in the background so the final window
+                            # restore and the next session need not wait on disk
+                            save_session_in_background(history_store, session)
                         
-                        break
+                            # Ensure window is restored to normal
+                            if status_update.window_state != "normal":
+                                restore_update = StatusUpdate.model_construct(
+                                    session_id=session_id,
+                                    subtask=None,
+                                    overall_status=status_update.overall_status,
+                                    message="Restoring window to normal state",
+                                    window_state="normal",
+                                    timestamp=now
+                                )
+                                await websocket_manager.broadcast_update(session_id, restore_update)
+                                logger.debug("Sent WINDOW_STATE_NORMAL for session %s", session_id)
+                        
+                            break
                 
-                # Store execution plan in cache for future reuse
-                if not cached_plan:
+                # Store the plan for future reuse; only plans that ran to
+                # completion are worth replaying
+                if not replay and session.status == "completed":
                     # Get the executed plan from session
-                    final_session = session_manager.get_session(session_id)
-                    if final_session and final_session.subtasks:
-                        from src.models import ExecutionPlan
-                        plan = ExecutionPlan(
-                            instruction=session.instruction,
-                            subtasks=[
-                                {
-                                    "tool_name": st.tool_name,
-                                    "tool_args": st.tool_args,
-                                    "description": st.description
-                                }
-                                for st in final_session.subtasks
-                            ],
-                            created_at=datetime.now()
-                        )
-                        plan_cache.store_plan(session.instruction, plan)
-                        logger.info(f"Stored execution plan in cache for session {session_id}")
+                    if session.subtasks:
+                        plan = ExecutionPlan.from_session(session)
+                        await asyncio.to_thread(plan_cache.store_plan, session.instruction, plan)
+                        logger.debug("Stored execution plan in cache for session %s", session_id)
                 
             except asyncio.CancelledError:
                 # Handle cancellation with resource cleanup
-                logger.info(f"Session {session_id} execution cancelled", session_id=session_id)
+                logger.info("Session %s execution cancelled", session_id, session_id=session_id)
                 
                 # Cleanup resources
                 if resource_manager:
                     await resource_manager.cleanup_all(suppress_errors=True)
                 
-                session = session_manager.get_session(session_id)
-                if session:
-                    session.status = "cancelled"
-                    session.completed_at = datetime.now()
-                    session.updated_at = datetime.now()
-                    session_manager.update_session(session_id, None)
-                    
-                    # Save cancelled session to history
-                    history_store.save_session(session)
-                    
-                    # Send cancellation update with window restore
-                    cancel_update = StatusUpdate(
-                        session_id=session_id,
-                        subtask=None,
-                        overall_status="cancelled",
-                        message="Execution cancelled by user",
-                        window_state="normal",
-                        timestamp=datetime.now()
-                    )
-                    await websocket_manager.broadcast_update(session_id, cancel_update)
-                    logger.info(f"Sent WINDOW_STATE_NORMAL after cancellation", session_id=session_id)
+                # The loop holds the managed instance, so no re-fetch is needed
+                now = datetime.now(timezone.utc)
+                session.status = "cancelled"
+                session.completed_at = now
+                session.updated_at = now
+                session_manager.update_session(session_id, None)
+                
+                # Save cancelled session to history
+                await asyncio.to_thread(history_store.save_session, session)
+                
+                # Send cancellation update with window restore
+                cancel_update = StatusUpdate.model_construct(
+                    session_id=session_id,
+                    subtask=None,
+                    overall_status="cancelled",
+                    message="Execution cancelled by user",
+                    window_state="normal",
+                    timestamp=now
+                )
+                await websocket_manager.broadcast_update(session_id, cancel_update)
+                logger.debug("Sent WINDOW_STATE_NORMAL after cancellation", session_id=session_id)
                 
                 raise
                 
             except Exception as e:
                 logger.error(
-                    f"Error executing session: {str(e)}",
+                    "Error executing session: %s", e,
                     session_id=session_id,
                     exc_info=True
                 )
@@ -551,40 +869,38 @@ async def process_execution_queue():
                     await resource_manager.cleanup_all(suppress_errors=True)
                 
                 # Mark session as failed
-                session = session_manager.get_session(session_id)
-                if session:
-                    session.status = "failed"
-                    session.completed_at = datetime.now()
-                    session.updated_at = datetime.now()
-                    session_manager.update_session(session_id, None)
-                    
-                    # Save failed session to history
-                    history_store.save_session(session)
-                    
-                    # Determine error message based on exception type
-                    from src.exceptions import AEGISException
-                    if isinstance(e, AEGISException):
-                        error_message = e.message
-                        error_details = e.details
-                    else:
-                        error_message = "Execution failed due to unexpected error"
-                        error_details = str(e)
-                    
-                    # Send failure update with window restore
-                    failure_update = StatusUpdate(
-                        session_id=session_id,
-                        subtask=None,
-                        overall_status="failed",
-                        message=f"{error_message}: {error_details}",
-                        window_state="normal",
-                        timestamp=datetime.now()
-                    )
-                    await websocket_manager.broadcast_update(session_id, failure_update)
-                    logger.info(f"Sent WINDOW_STATE_NORMAL after failure", session_id=session_id)
+                now = datetime.now(timezone.utc)
+                session.status = "failed"
+                session.completed_at = now
+                session.updated_at = now
+                session_manager.update_session(session_id, None)
+                
+                # Save failed session to history
+                await asyncio.to_thread(history_store.save_session, session)
+                
+                # Determine error message based on exception type
+                if isinstance(e, AEGISException):
+                    error_message = e.message
+                    error_details = e.details
+                else:
+                    error_message = "Execution failed due to unexpected error"
+                    error_details = str(e)
+                
+                # Send failure update with window restore
+                failure_update = StatusUpdate.model_construct(
+                    session_id=session_id,
+                    subtask=None,
+                    overall_status="failed",
+                    message=f"{error_message}: {error_details}",
+                    window_state="normal",
+                    timestamp=now
+                )
+                await websocket_manager.broadcast_update(session_id, failure_update)
+                logger.debug("Sent WINDOW_STATE_NORMAL after failure", session_id=session_id)
             
             # Mark task as done in queue
             request_queue.task_done()
-            logger.info(f"Completed processing session", session_id=session_id)
+            logger.info("Completed processing session", session_id=session_id)
             
             # Clear session context
             if session_id:
@@ -597,7 +913,7 @@ async def process_execution_queue():
                 await resource_manager.cleanup_all(suppress_errors=True)
             break
         except Exception as e:
-            logger.error(f"Error in execution queue processor: {e}", session_id=session_id, exc_info=True)
+            logger.error("Error in execution queue processor: %s", e, session_id=session_id, exc_info=True)
             # Cleanup resources on error
             if resource_manager:
                 await resource_manager.cleanup_all(suppress_errors=True)
@@ -607,77 +923,6 @@ async def process_execution_queue():
             await asyncio.sleep(1)  # Prevent tight loop on errors
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on application startup"""
-    global preprocessor, plan_cache, adk_agent, session_manager, history_store, websocket_manager, execution_task
-    
-    logger.info("🚀 AEGIS RPA Backend starting up...")
-    
-    try:
-        # Log configuration summary
-        config_summary = config.get_summary()
-        logger.info(f"Configuration loaded: {config_summary}")
-        
-        # Initialize services
-        preprocessor = PreProcessor()
-        logger.info("✓ PreProcessor initialized")
-        
-        plan_cache = PlanCache()
-        logger.info("✓ PlanCache initialized")
-        
-        adk_agent = ADKAgentManager()
-        adk_agent.initialize_agent()
-        logger.info("✓ ADK Agent initialized")
-        
-        session_manager = SessionManager()
-        logger.info("✓ SessionManager initialized")
-        
-        history_store = HistoryStore()
-        logger.info("✓ HistoryStore initialized")
-        
-        websocket_manager = WebSocketManager()
-        logger.info("✓ WebSocketManager initialized")
-        
-        # Start background execution queue processor
-        execution_task = asyncio.create_task(process_execution_queue())
-        logger.info("✓ Execution queue processor started")
-        
-        logger.info("🎉 AEGIS RPA Backend startup complete!")
-        
-    except Exception as e:
-        logger.error(f"❌ Failed to start AEGIS RPA Backend: {e}")
-        raise
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup resources on application shutdown"""
-    global execution_task
-    
-    logger.info("🛑 AEGIS RPA Backend shutting down...")
-    
-    try:
-        # Cancel background task
-        if execution_task:
-            execution_task.cancel()
-            try:
-                await execution_task
-            except asyncio.CancelledError:
-                pass
-        
-        # Close all WebSocket connections
-        if websocket_manager:
-            # Disconnect all sessions
-            for session_id in list(websocket_manager.connections.keys()):
-                await websocket_manager.disconnect(session_id)
-        
-        logger.info("✓ Cleanup complete")
-        
-    except Exception as e:
-        logger.error(f"Error during shutdown: {e}")
-
-
 @app.exception_handler(ValidationError)
 async def validation_error_handler(request: Request, exc: ValidationError):
     """
@@ -686,11 +931,11 @@ async def validation_error_handler(request: Request, exc: ValidationError):
     Validates: Requirement 9.2
     """
     logger.warning(
-        f"Validation error: {exc.message}",
+        "Validation error: %s", exc.message,
         session_id=exc.session_id,
         extra_data=exc.context
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content=exc.to_dict()
     )
@@ -702,27 +947,43 @@ async def session_not_found_handler(request: Request, exc: SessionNotFoundError)
     Handle session not found errors (HTTP 404).
     """
     logger.warning(
-        f"Session not found: {exc.message}",
+        "Session not found: %s", exc.message,
         session_id=exc.session_id,
         extra_data=exc.context
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_404_NOT_FOUND,
         content=exc.to_dict()
     )
 
 
+@app.exception_handler(QueueFullError)
+async def queue_full_handler(request: Request, exc: QueueFullError):
+    """
+    Handle a full execution queue (HTTP 429).
+    """
+    logger.warning(
+        "Queue full: %s", exc.message,
+        extra_data=exc.context
+    )
+    return ORJSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content=exc.to_dict(),
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
 @app.exception_handler(ClientError)
 async def client_error_handler(request: Request, exc: ClientError):
     """
     Handle client errors (HTTP 400).
     """
     logger.warning(
-        f"Client error: {exc.message}",
+        "Client error: %s", exc.message,
         session_id=exc.session_id,
         extra_data=exc.context
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
         content=exc.to_dict()
     )
@@ -736,11 +997,11 @@ async def system_error_handler(request: Request, exc: SystemError):
     Validates: Requirement 8.1
     """
     logger.error(
-        f"System error: {exc.message}",
+        "System error: %s", exc.message,
         session_id=exc.session_id,
         extra_data=exc.context
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=exc.to_dict()
     )
@@ -752,11 +1013,11 @@ async def aegis_exception_handler(request: Request, exc: AEGISException):
     Handle all AEGIS-specific exceptions.
     """
     logger.error(
-        f"AEGIS exception: {exc.message}",
+        "AEGIS exception: %s", exc.message,
         session_id=exc.session_id,
         extra_data=exc.context
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=exc.to_dict()
     )
@@ -769,8 +1030,8 @@ async def global_exception_handler(request: Request, exc: Exception):
     
     Validates: Requirement 8.1
     """
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "error": "InternalServerError",
@@ -780,11 +1041,59 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
+def select_server_implementations() -> tuple[str, str, str]:
+    """
+    Select the event loop, HTTP parser and WebSocket implementations for uvicorn.
+
+    Prefers the C-accelerated uvloop/httptools pair and the websockets
+    library installed by uvicorn[standard]. uvloop is not available on
+    Windows, so the stdlib asyncio loop is used there instead. Choosing
+    explicitly avoids uvicorn's silent "auto" fallback and makes the
+    selected stack visible in the startup log.
+
+    Returns:
+        Tuple of (loop, http, ws) implementation names
+    """
+    loop = "asyncio"
+    if sys.platform != "win32" and importlib.util.find_spec("uvloop") is not None:
+        loop = "uvloop"
+
+    http = "httptools" if importlib.util.find_spec("httptools") is not None else "h11"
+    ws = "websockets" if importlib.util.find_spec("websockets") is not None else "wsproto"
+
+    return loop, http, ws
+
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
+    # The execution queue and service instances live in this process, so the
+    # server must run as a single worker. Desktop automation is serial anyway.
+    # WebSocket keepalive uses protocol-level ping/pong frames from the server,
+    # which also drops connections whose pong does not arrive in time.
+    # Per-request access logging is off; the app logs request details at DEBUG.
+    # The backend is reached directly rather than through a reverse proxy, so
+    # the forwarded-headers middleware is skipped.
+    # The app object is handed over directly so uvicorn does not re-import
+    # main; the reloader needs an import string, so only that path uses one.
+    loop_impl, http_impl, ws_impl = select_server_implementations()
+    logger.info("Server stack: loop=%s, http=%s, ws=%s", loop_impl, http_impl, ws_impl)
+    server_config = uvicorn.Config(
+        "main:app" if config.RELOAD else app,
         host=config.HOST,
         port=config.PORT,
-        reload=True,
+        reload=config.RELOAD,
+        loop=loop_impl,
+        http=http_impl,
+        ws=ws_impl,
+        lifespan="on",
+        interface="asgi3",
+        ws_ping_interval=config.WEBSOCKET_PING_INTERVAL,
+        ws_ping_timeout=config.WEBSOCKET_PING_INTERVAL,
+        access_log=False,
+        proxy_headers=False,
         log_level=config.LOG_LEVEL.lower()
     )
+    server = uvicorn.Server(server_config)
+    if server_config.should_reload:
+        ChangeReload(server_config, target=server.run, sockets=[server_config.bind_socket()]).run()
+    else:
+        server.run()
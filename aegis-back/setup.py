@@ -19,12 +19,22 @@ setup(
         "uvicorn[standard]>=0.24.0",
         "pydantic>=2.5.0",
         "pydantic-settings>=2.1.0",
+        "orjson>=3.9.10",
         "google-generativeai>=0.3.1",
         "pyautogui>=0.9.54",
         "python-dotenv>=1.0.0",
         "pillow>=10.1.0",
     ],
     extras_require={
+        # Faster screen capture and comparison in the action observer
+        "vision": [
+            "mss>=9.0.1",
+            "numpy>=1.24.0",
+        ],
+        # In-process OCR for error dialog detection; needs the Tesseract libraries
+        "ocr": [
+            "tesserocr>=2.6.0",
+        ],
         "dev": [
             "pytest>=7.4.3",
             "pytest-asyncio>=0.21.1",
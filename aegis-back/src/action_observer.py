@@ -5,23 +5,190 @@ This module provides the ActionObserver class that captures screen states,
 verifies action success through visual comparison, and detects error dialogs.
 """
 
+import asyncio
 import logging
+import math
 import base64
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from functools import cached_property, reduce
 from typing import Optional, Tuple
 from io import BytesIO
-from PIL import Image, ImageChops
+from PIL import Image, ImageChops, ImageOps
 import pyautogui
 
-# Optional OCR support
+# Optional OCR support; tesserocr keeps Tesseract loaded in-process, while
+# pytesseract starts a tesseract subprocess per image
+try:
+    import tesserocr
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
 try:
     import pytesseract
-    OCR_AVAILABLE = True
+    PYTESSERACT_AVAILABLE = True
+except ImportError:
+    PYTESSERACT_AVAILABLE = False
+
+OCR_AVAILABLE = TESSEROCR_AVAILABLE or PYTESSERACT_AVAILABLE
+if not OCR_AVAILABLE:
+    logging.warning("tesserocr/pytesseract not available - OCR functionality will be disabled")
+
+# Optional mss support for faster screen capture
+try:
+    import mss
+    MSS_AVAILABLE = True
 except ImportError:
-    OCR_AVAILABLE = False
-    logging.warning("pytesseract not available - OCR functionality will be disabled")
+    MSS_AVAILABLE = False
+
+# Optional NumPy support for faster image comparison
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Text that marks an error dialog or message on screen
+ERROR_KEYWORDS = (
+    "error",
+    "failed",
+    "exception",
+    "could not",
+    "unable to",
+    "cannot",
+    "not found",
+    "access denied",
+    "permission denied"
+)
+
+# All keywords in one case-insensitive pattern, so OCR text is scanned once
+_ERROR_KEYWORD_PATTERN = re.compile(
+    "|".join(re.escape(keyword) for keyword in ERROR_KEYWORDS),
+    re.IGNORECASE
+)
+
+# Image modes stored as one byte per band, which NumPy can compare directly
+# from the raw buffer
+_BYTE_MODES = frozenset({"L", "LA", "RGB", "RGBA", "RGBX"})
+
+# Pixels compared per step when checking a similarity threshold
+_COMPARE_TILE_PIXELS = 1 << 18
+
+
+def _pixel_similarity(img1: Image.Image, img2: Image.Image) -> float:
+    """
+    Return the fraction of pixels that are identical in two same-sized images.
+    
+    Identical images are detected with a single bytes comparison (memcmp).
+    Otherwise NumPy compares the raw buffers in one vectorized pass, with a
+    PIL difference histogram as the fallback.
+    
+    Args:
+        img1: First PIL Image
+        img2: Second PIL Image of the same size
+    
+    Returns:
+        Similarity score between 0 and 1 (1 = identical)
+    """
+    if img2.mode != img1.mode:
+        img2 = img2.convert(img1.mode)
+    
+    # Unchanged screens are common and need no per-pixel work
+    data1 = img1.tobytes()
+    data2 = img2.tobytes()
+    if data1 == data2:
+        return 1.0 if data1 else 0.0
+    
+    if NUMPY_AVAILABLE and img1.mode in _BYTE_MODES:
+        bands = len(img1.getbands())
+        equal = np.frombuffer(data1, dtype=np.uint8) == np.frombuffer(data2, dtype=np.uint8)
+        # A pixel only counts as unchanged if every band matches
+        equal = equal.reshape(-1, bands).all(axis=1)
+        return float(np.count_nonzero(equal)) / equal.size
+    
+    # A pixel is unchanged only if its difference is zero in every band, so
+    # take the per-pixel maximum across bands before counting zeros
+    difference = ImageChops.difference(img1, img2)
+    bands = difference.split()
+    if len(bands) > 1:
+        difference = reduce(ImageChops.lighter, bands)
+    if difference.mode != 'L':
+        difference = difference.convert('L')
+    histogram = difference.histogram()
+    total_pixels = sum(histogram)
+    return histogram[0] / total_pixels if total_pixels > 0 else 0.0
+
+
+def _crop_to_common_size(img1: Image.Image, img2: Image.Image) -> Tuple[Image.Image, Image.Image]:
+    """
+    Crop two images to their shared top-left area.
+    
+    Resampling one image to the other's size would cost a full filter pass
+    and compare pixels that never lined up, so only the overlap is kept.
+    
+    Args:
+        img1: First PIL Image
+        img2: Second PIL Image
+    
+    Returns:
+        Both images cropped to the same size
+    """
+    box = (0, 0, min(img1.width, img2.width), min(img1.height, img2.height))
+    return img1.crop(box), img2.crop(box)
+
+
+def _similarity_below(img1: Image.Image, img2: Image.Image, threshold: float) -> bool:
+    """
+    Return whether _pixel_similarity(img1, img2) is below threshold.
+    
+    With NumPy the buffers are compared in tiles, stopping as soon as the
+    count of changed pixels decides the answer, so a visible change is
+    usually found without reading both screens in full.
+    
+    Args:
+        img1: First PIL Image
+        img2: Second PIL Image of the same size
+        threshold: Similarity threshold between 0 and 1
+    
+    Returns:
+        True if the share of identical pixels is below threshold
+    """
+    if not NUMPY_AVAILABLE or img1.mode not in _BYTE_MODES:
+        return _pixel_similarity(img1, img2) < threshold
+    
+    if img2.mode != img1.mode:
+        img2 = img2.convert(img1.mode)
+    
+    data1 = img1.tobytes()
+    data2 = img2.tobytes()
+    if data1 == data2:
+        return (1.0 if data1 else 0.0) < threshold
+    
+    bands = len(img1.getbands())
+    pixels1 = np.frombuffer(data1, dtype=np.uint8).reshape(-1, bands)
+    pixels2 = np.frombuffer(data2, dtype=np.uint8).reshape(-1, bands)
+    total = len(pixels1)
+    # identical / total < threshold  <=>  identical < ceil(threshold * total),
+    # which gives a whole number of changed pixels to count up to
+    limit = total - math.ceil(threshold * total)
+    
+    changed = 0
+    for start in range(0, total, _COMPARE_TILE_PIXELS):
+        end = min(start + _COMPARE_TILE_PIXELS, total)
+        changed += int(np.count_nonzero((pixels1[start:end] != pixels2[start:end]).any(axis=1)))
+        if changed > limit:
+            return True
+        # Even if every remaining pixel changed, the limit would not be passed
+        if changed + (total - end) <= limit:
+            return False
+    
+    return False
+
 
 class ScreenState:
     """
@@ -30,7 +197,8 @@ class ScreenState:
     Attributes:
         image: PIL Image object of the screenshot
         timestamp: When the screenshot was captured
-        base64_data: Base64-encoded PNG data for storage/transmission
+        base64_data: Base64-encoded PNG data for storage/transmission,
+            encoded on first access
     """
     
     def __init__(self, image: Image.Image, timestamp: float):
@@ -43,7 +211,16 @@ class ScreenState:
         """
         self.image = image
         self.timestamp = timestamp
-        self.base64_data = self._encode_image(image)
+    
+    @cached_property
+    def base64_data(self) -> str:
+        """
+        Base64-encoded PNG of the screenshot.
+        
+        PNG compression dominates the cost of a capture, and verification
+        only needs the pixels, so the encoding runs once and only when used.
+        """
+        return self._encode_image(self.image)
     
     def _encode_image(self, image: Image.Image) -> str:
         """
@@ -72,6 +249,21 @@ class ScreenState:
         """
         x, y, width, height = region
         return self.image.crop((x, y, x + width, y + height))
+    
+    def encoded_region(self, region: Tuple[int, int, int, int]) -> str:
+        """
+        Encode only a region of the screen state.
+        
+        Callers that send part of the screen should use this rather than
+        base64_data, so the PNG encoder only sees the crop.
+        
+        Args:
+            region: (x, y, width, height) tuple
+        
+        Returns:
+            Base64-encoded PNG string of the cropped region
+        """
+        return self._encode_image(self.get_region(region))
 
 
 class ErrorInfo:
@@ -109,16 +301,58 @@ class ActionObserver:
     - Error dialog detection using OCR
     """
     
-    def __init__(self, similarity_threshold: float = 0.95):
+    # Longest side, in pixels, of images passed to OCR; 1080p screens are
+    # read as is, larger ones are scaled down since OCR time grows with area
+    OCR_MAX_DIMENSION = 1920
+    
+    def __init__(self, similarity_threshold: float = 0.95, ocr_cache_size: int = 64):
         """
         Initialize the Action Observer.
         
         Args:
             similarity_threshold: Threshold for considering images similar (0-1)
+            ocr_cache_size: Number of recent screenshots whose OCR text is kept
         """
         self.similarity_threshold = similarity_threshold
+        # OCR text keyed by a digest of the screenshot pixels; repeated
+        # checks of an unchanged screen skip Tesseract
+        self.ocr_cache_size = ocr_cache_size
+        self._ocr_cache: OrderedDict[bytes, str] = OrderedDict()
+        self._ocr_lock = threading.Lock()
+        # tesserocr APIs are not thread-safe, so each OCR thread gets its own;
+        # all are kept so close() can release them
+        self._ocr_local = threading.local()
+        self._ocr_apis = []
+        # mss handles are bound to the thread that created them, so each
+        # capturing thread keeps its own
+        self._capture_local = threading.local()
         logger.info(f"ActionObserver initialized with similarity_threshold={similarity_threshold}")
     
+    def _grab(self, region: Optional[Tuple[int, int, int, int]]) -> Image.Image:
+        """
+        Take a screenshot with mss, reusing this thread's capture handle.
+        
+        Args:
+            region: Optional (x, y, width, height) tuple; the primary monitor
+                is captured when omitted
+        
+        Returns:
+            RGB PIL Image of the captured area
+        """
+        sct = getattr(self._capture_local, "sct", None)
+        if sct is None:
+            sct = self._capture_local.sct = mss.mss()
+        
+        if region:
+            x, y, width, height = region
+            monitor = {"left": x, "top": y, "width": width, "height": height}
+        else:
+            monitor = sct.monitors[1]
+        
+        shot = sct.grab(monitor)
+        # Decode the BGRA buffer to RGB in one pass inside PIL
+        return Image.frombytes("RGB", shot.size, shot.bgra, "raw", "BGRX")
+    
     def capture_state(self, region: Optional[Tuple[int, int, int, int]] = None) -> ScreenState:
         """
         Capture the current screen state.
@@ -134,7 +368,9 @@ class ActionObserver:
         try:
             logger.debug(f"Capturing screen state, region={region}")
             
-            if region:
+            if MSS_AVAILABLE:
+                screenshot = self._grab(region)
+            elif region:
                 x, y, width, height = region
                 screenshot = pyautogui.screenshot(region=(x, y, width, height))
             else:
@@ -150,6 +386,21 @@ class ActionObserver:
             logger.error(f"Failed to capture screen state: {e}")
             raise
     
+    async def capture_state_async(self, region: Optional[Tuple[int, int, int, int]] = None) -> ScreenState:
+        """
+        Capture the current screen state in a worker thread.
+        
+        Each thread keeps its own mss handle, so concurrent captures from
+        the thread pool do not share one.
+        
+        Args:
+            region: Optional (x, y, width, height) tuple to capture specific region
+        
+        Returns:
+            ScreenState object containing the captured screen
+        """
+        return await asyncio.to_thread(self.capture_state, region)
+    
     def verify_action(
         self, 
         before: ScreenState, 
@@ -187,40 +438,30 @@ class ActionObserver:
             # Ensure images are the same size
             if before_img.size != after_img.size:
                 logger.warning(f"Image size mismatch: {before_img.size} vs {after_img.size}")
-                # Resize to match
-                after_img = after_img.resize(before_img.size)
-            
-            # Calculate difference between images
-            diff = ImageChops.difference(before_img, after_img)
+                before_img, after_img = _crop_to_common_size(before_img, after_img)
             
-            # Calculate similarity score
-            # Convert to grayscale and get histogram
-            diff_gray = diff.convert('L')
-            histogram = diff_gray.histogram()
+            # Every strategy only needs to know which side of the threshold
+            # the similarity falls on, so the comparison can stop early
+            changed = _similarity_below(before_img, after_img, self.similarity_threshold)
             
-            # Calculate percentage of pixels that are identical
-            total_pixels = sum(histogram)
-            identical_pixels = histogram[0]  # Pixels with 0 difference
-            similarity = identical_pixels / total_pixels if total_pixels > 0 else 0
-            
-            logger.debug(f"Image similarity: {similarity:.4f}")
+            logger.debug(f"Image changed beyond threshold: {changed}")
             
             # Determine if action succeeded based on expected change
             if expected_change in ["click", "type", "key_press", "scroll"]:
                 # For these actions, we expect some change (similarity < threshold)
-                action_succeeded = similarity < self.similarity_threshold
+                action_succeeded = changed
                 logger.info(f"Action verification: expected change detected={action_succeeded}")
                 return action_succeeded
             
             elif expected_change == "no_change":
                 # For verification that nothing changed
-                action_succeeded = similarity >= self.similarity_threshold
+                action_succeeded = not changed
                 logger.info(f"Action verification: no change confirmed={action_succeeded}")
                 return action_succeeded
             
             else:
                 # Default: assume change is expected
-                action_succeeded = similarity < self.similarity_threshold
+                action_succeeded = changed
                 logger.info(f"Action verification (default): change detected={action_succeeded}")
                 return action_succeeded
                 
@@ -257,40 +498,23 @@ class ActionObserver:
             logger.debug("Detecting error dialogs using OCR")
             
             # Perform OCR on the screen
-            text = pytesseract.image_to_string(state.image)
-            text_lower = text.lower()
-            
-            # Check for common error indicators
-            error_keywords = [
-                "error",
-                "failed",
-                "exception",
-                "could not",
-                "unable to",
-                "cannot",
-                "not found",
-                "access denied",
-                "permission denied"
-            ]
+            text = self._ocr_text(state.image)
             
-            for keyword in error_keywords:
-                if keyword in text_lower:
-                    logger.warning(f"Error dialog detected with keyword: '{keyword}'")
-                    
-                    # Try to extract error message (simple heuristic)
-                    lines = text.split('\n')
-                    error_message = None
-                    for i, line in enumerate(lines):
-                        if keyword in line.lower():
-                            # Take this line and next few lines as error message
-                            error_message = ' '.join(lines[i:min(i+3, len(lines))]).strip()
-                            break
-                    
-                    return ErrorInfo(
-                        error_type="dialog",
-                        message=error_message,
-                        location=None  # Could be enhanced with image processing
-                    )
+            # Find the first common error indicator in one pass
+            match = _ERROR_KEYWORD_PATTERN.search(text)
+            if match:
+                logger.warning(f"Error dialog detected with keyword: '{match.group().lower()}'")
+                
+                # Take the matching line and the next two as the error message
+                line_start = text.rfind('\n', 0, match.start()) + 1
+                lines = text[line_start:].split('\n', 3)[:3]
+                error_message = ' '.join(lines).strip()
+                
+                return ErrorInfo(
+                    error_type="dialog",
+                    message=error_message,
+                    location=None  # Could be enhanced with image processing
+                )
             
             logger.debug("No error dialogs detected")
             return None
@@ -299,6 +523,92 @@ class ActionObserver:
             logger.error(f"Failed to detect error dialogs: {e}")
             return None
     
+    async def detect_error_dialogs_async(self, state: Optional[ScreenState] = None) -> Optional[ErrorInfo]:
+        """
+        Run detect_error_dialogs in a worker thread.
+        
+        Capture and OCR block for tens to hundreds of milliseconds; both
+        tesserocr and the pytesseract subprocess release the GIL while they
+        work, so a thread keeps the event loop responsive.
+        
+        Args:
+            state: Optional ScreenState to analyze (captures new one if not provided)
+        
+        Returns:
+            ErrorInfo if error detected, None otherwise
+        """
+        return await asyncio.to_thread(self.detect_error_dialogs, state)
+    
+    def _ocr_text(self, image: Image.Image) -> str:
+        """
+        Return the OCR text of an image, reusing results for identical pixels.
+        
+        Args:
+            image: PIL Image to read
+        
+        Returns:
+            Text recognized by Tesseract
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{image.mode}{image.size}".encode())
+        digest.update(image.tobytes())
+        key = digest.digest()
+        with self._ocr_lock:
+            text = self._ocr_cache.get(key)
+            if text is not None:
+                self._ocr_cache.move_to_end(key)
+                return text
+        
+        ocr_image = self._prepare_for_ocr(image)
+        if TESSEROCR_AVAILABLE:
+            api = self._ocr_api()
+            api.SetImage(ocr_image)
+            text = api.GetUTF8Text()
+        else:
+            text = pytesseract.image_to_string(ocr_image)
+        
+        with self._ocr_lock:
+            self._ocr_cache[key] = text
+            if len(self._ocr_cache) > self.ocr_cache_size:
+                self._ocr_cache.popitem(last=False)
+        return text
+    
+    def _prepare_for_ocr(self, image: Image.Image) -> Image.Image:
+        """
+        Reduce a screenshot to what OCR needs.
+        
+        Converts to contrast-stretched grayscale, which Tesseract would
+        compute anyway and which is a third of the data to hand over, and
+        scales images larger than OCR_MAX_DIMENSION down.
+        
+        Args:
+            image: Screenshot to prepare
+        
+        Returns:
+            Grayscale PIL Image
+        """
+        gray = ImageOps.autocontrast(ImageOps.grayscale(image))
+        if max(gray.size) > self.OCR_MAX_DIMENSION:
+            gray.thumbnail((self.OCR_MAX_DIMENSION, self.OCR_MAX_DIMENSION), Image.Resampling.BILINEAR)
+        return gray
+    
+    def _ocr_api(self):
+        """Return this thread's persistent tesserocr API, creating it on first use."""
+        api = getattr(self._ocr_local, "api", None)
+        if api is None:
+            api = self._ocr_local.api = tesserocr.PyTessBaseAPI()
+            with self._ocr_lock:
+                self._ocr_apis.append(api)
+        return api
+    
+    def close(self) -> None:
+        """Release the Tesseract engines held by this observer."""
+        with self._ocr_lock:
+            apis, self._ocr_apis = self._ocr_apis, []
+        for api in apis:
+            api.End()
+        self._ocr_local = threading.local()
+    
     def calculate_image_similarity(self, img1: Image.Image, img2: Image.Image) -> float:
         """
         Calculate similarity score between two images.
@@ -313,19 +623,9 @@ class ActionObserver:
         try:
             # Ensure same size
             if img1.size != img2.size:
-                img2 = img2.resize(img1.size)
-            
-            # Calculate difference
-            diff = ImageChops.difference(img1, img2)
-            diff_gray = diff.convert('L')
-            histogram = diff_gray.histogram()
-            
-            # Calculate similarity
-            total_pixels = sum(histogram)
-            identical_pixels = histogram[0]
-            similarity = identical_pixels / total_pixels if total_pixels > 0 else 0
+                img1, img2 = _crop_to_common_size(img1, img2)
             
-            return similarity
+            return _pixel_similarity(img1, img2)
             
         except Exception as e:
             logger.error(f"Failed to calculate image similarity: {e}")
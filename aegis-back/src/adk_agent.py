@@ -8,21 +8,84 @@ Validates: Requirements 1.1, 1.2, 1.3, 1.4
 """
 
 import os
-import time
+import asyncio
 import json
 import re
 import logging
-from typing import AsyncIterator, List, Dict, Any, Optional
-from datetime import datetime
+from contextlib import aclosing
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Dict, Any, Optional
+from datetime import datetime, timezone
 import google.generativeai as genai
 
-from src.models import StatusUpdate, Subtask, SubtaskStatus, ToolResult
+from src.models import ExecutionPlan, StatusUpdate, Subtask, SubtaskStatus, ToolResult
 from src.rpa_tools import TOOLS
 from src.config import get_config
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Tool call extraction from free-form model responses
+_JSON_OBJECT_PATTERN = re.compile(r'\{.*\}')
+
+# Common application keywords
+_APP_KEYWORDS = {
+    "notepad": ["notepad"],
+    "chrome": ["chrome", "browser", "google chrome"],
+    "firefox": ["firefox", "mozilla"],
+    "edge": ["edge", "microsoft edge"],
+    "outlook": ["outlook", "email"],
+    "excel": ["excel", "spreadsheet"],
+    "word": ["word", "document"],
+    "powerpoint": ["powerpoint", "presentation", "slides"],
+    "calculator": ["calculator", "calc"],
+    "explorer": ["explorer", "file explorer", "files"],
+    "cmd": ["cmd", "command prompt", "terminal"],
+    "paint": ["paint", "mspaint"]
+}
+_KEYWORD_TO_APP = {
+    keyword: app_name
+    for app_name, keywords in _APP_KEYWORDS.items()
+    for keyword in keywords
+}
+# One pass over the instruction finds every keyword; longer keywords are
+# tried first so "google chrome" wins over "chrome"
+_APP_KEYWORD_PATTERN = re.compile(
+    "|".join(re.escape(keyword) for keyword in sorted(_KEYWORD_TO_APP, key=len, reverse=True))
+)
+
+# Workflow guidance appended to the prompt for multi-application tasks
+_MULTI_APP_WORKFLOW = """
+When switching between applications:
+1. Use list_open_windows to check which applications are running
+2. Use launch_application if an application is not running
+3. Use focus_window to bring the target application to foreground before actions
+4. Use copy_to_clipboard and paste_from_clipboard for data transfer between apps
+5. Track which application is currently active
+
+Example multi-app workflow:
+{"tool": "list_open_windows", "args": {}}
+{"tool": "launch_application", "args": {"app_name": "notepad", "wait_time": 5}}
+{"tool": "focus_window", "args": {"window_title": "notepad"}}
+{"tool": "type_text", "args": {"text": "Hello", "interval": 0.05}}
+{"tool": "copy_to_clipboard", "args": {"text": "Hello"}}
+{"tool": "focus_window", "args": {"window_title": "chrome"}}
+{"tool": "paste_from_clipboard", "args": {}}
+"""
+
+
+async def _iterate(items: Iterable[Any]) -> AsyncIterator[Any]:
+    """Yield the items of a plain iterable as an async iterator."""
+    for item in items:
+        yield item
+
+
+async def _prepend(first: Any, rest: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    """Yield first, then the items of rest, closing rest when done."""
+    yield first
+    async with aclosing(rest):
+        async for item in rest:
+            yield item
+
 
 class ADKAgentManager:
     """
@@ -56,8 +119,15 @@ class ADKAgentManager:
         self.model = None
         self.tools = []
         self.tool_map = {}
+        # Prompt text for the registered tools; rebuilt when tools change
+        self._tool_descriptions: Optional[str] = None
+        self._system_prompt_prefix: Optional[str] = None
         self.active_application = None  # Track currently active application
         self.application_context = {}  # Store application-specific context
+        # Serializes desktop interaction; planning may overlap across sessions
+        self._desktop_lock = asyncio.Lock()
+        # Guards lazy initialization so concurrent first uses initialize once
+        self._init_lock = asyncio.Lock()
         
         # Validate API key is provided and not a placeholder
         if not self.api_key or self.api_key in ["", "your_google_api_key_here"]:
@@ -66,7 +136,7 @@ class ADKAgentManager:
                 "or pass api_key parameter."
             )
         
-        logger.info(f"Initializing ADK Agent Manager with model: {self.model_name}")
+        logger.info("Initializing ADK Agent Manager with model: %s", self.model_name)
     
     def initialize_agent(self) -> None:
         """
@@ -87,12 +157,25 @@ class ADKAgentManager:
             # Create the model
             self.model = genai.GenerativeModel(model_name=self.model_name)
             
-            logger.info(f"ADK agent initialized successfully with {len(self.tool_map)} tools")
+            logger.info("ADK agent initialized successfully with %s tools", len(self.tool_map))
             
         except Exception as e:
-            logger.error(f"Failed to initialize ADK agent: {e}")
+            logger.error("Failed to initialize ADK agent: %s", e)
             raise RuntimeError(f"ADK agent initialization failed: {e}")
     
+    async def ensure_initialized(self) -> None:
+        """
+        Initialize the agent on first use.
+        
+        Concurrent callers wait for a single initialize_agent() run, which
+        happens in a worker thread; later calls return immediately.
+        """
+        if self.model is not None:
+            return
+        async with self._init_lock:
+            if self.model is None:
+                await asyncio.to_thread(self.initialize_agent)
+    
     def register_toolbox(self, tools: List[callable]) -> None:
         """
         Register RPA toolbox functions with the ADK agent.
@@ -108,7 +191,12 @@ class ADKAgentManager:
             func_name = tool_func.__name__
             self.tool_map[func_name] = tool_func
         
-        logger.info(f"Registered {len(self.tool_map)} tools with ADK agent")
+        # Build the prompt text now so the first request does not pay for it
+        self._tool_descriptions = None
+        self._system_prompt_prefix = None
+        self._generate_system_prompt_prefix()
+        
+        logger.info("Registered %s tools with ADK agent", len(self.tool_map))
     
     async def execute_instruction(
         self,
@@ -133,76 +221,125 @@ class ADKAgentManager:
         if not self.model:
             raise RuntimeError("ADK agent not initialized. Call initialize_agent() first.")
         
-        logger.info(f"Executing instruction for session {session_id}: {instruction}")
+        logger.info("Executing instruction for session %s: %s", session_id, instruction)
         
-        try:
-            # Identify applications mentioned in the instruction
-            identified_apps = self._identify_applications(instruction)
-            
-            # Create system prompt for RPA context with tool descriptions
-            tool_descriptions = self._generate_tool_descriptions()
-            
-            # Add multi-app orchestration guidance if multiple apps detected
-            multi_app_guidance = ""
-            if len(identified_apps) > 1:
-                multi_app_guidance = f"""
-
-IMPORTANT - Multi-Application Task Detected:
-This task involves multiple applications: {', '.join(identified_apps)}
-
-When switching between applications:
-1. Use list_open_windows to check which applications are running
-2. Use launch_application if an application is not running
-3. Use focus_window to bring the target application to foreground before actions
-4. Use copy_to_clipboard and paste_from_clipboard for data transfer between apps
-5. Track which application is currently active
-
-Example multi-app workflow:
-{{"tool": "list_open_windows", "args": {{}}}}
-{{"tool": "launch_application", "args": {{"app_name": "notepad", "wait_time": 5}}}}
-{{"tool": "focus_window", "args": {{"window_title": "notepad"}}}}
-{{"tool": "type_text", "args": {{"text": "Hello", "interval": 0.05}}}}
-{{"tool": "copy_to_clipboard", "args": {{"text": "Hello"}}}}
-{{"tool": "focus_window", "args": {{"window_title": "chrome"}}}}
-{{"tool": "paste_from_clipboard", "args": {{}}}}
-"""
-            
-            system_prompt = f"""You are an RPA (Robotic Process Automation) agent that executes desktop automation tasks.
-You have access to the following tools:
-
-{tool_descriptions}
-
-When given a task instruction:
-1. Break it down into clear, sequential subtasks
-2. For each subtask, output a JSON object with the tool to use and its parameters
-3. Format: {{"tool": "tool_name", "args": {{"param1": "value1", "param2": "value2"}}}}
-4. Output one tool call per line
-5. Be specific with coordinates, text, and parameters
-{multi_app_guidance}
-
-Task: {instruction}
-
-Generate the execution plan as a series of tool calls in JSON format:"""
-            
-            # Generate content from Gemini
-            response = self.model.generate_content(system_prompt)
-            
-            # Parse the response to extract tool calls
-            tool_calls = self._parse_tool_calls(response.text)
+        # Build the prompt once; only the Gemini call is retried
+        system_prompt = self._build_system_prompt(instruction)
+        
+        # Retry logic with exponential backoff
+        max_retries = 1
+        retry_delay = 2
+        
+        for attempt in range(max_retries + 1):
+            # Once an update is out, actions may have run, so retrying is unsafe
+            started = False
             
-            if not tool_calls:
-                # No tool calls found, treat as simple completion
-                yield StatusUpdate(
+            try:
+                # Stream the plan from Gemini so the first action can start as
+                # soon as its line arrives, rather than after the whole response
+                response = await self.model.generate_content_async(system_prompt, stream=True)
+                tool_calls = self._stream_tool_calls(response)
+                
+                first_call = await anext(tool_calls, None)
+                if first_call is None:
+                    # No tool calls found, treat as simple completion
+                    yield StatusUpdate.model_construct(
+                        session_id=session_id,
+                        subtask=None,
+                        overall_status="completed",
+                        message="Task completed (no actions required)",
+                        timestamp=datetime.now(timezone.utc)
+                    )
+                    return
+                
+                # Execute the plan as it streams in; only this phase touches the desktop
+                planned_calls = _prepend(first_call, tool_calls)
+                async with aclosing(self._execute_tool_calls(planned_calls, session_id)) as updates:
+                    async for update in updates:
+                        started = True
+                        yield update
+                return
+                
+            except Exception as e:
+                logger.error("Error during instruction execution: %s", e)
+                
+                # Check if we should retry (simple heuristic)
+                message = str(e).lower()
+                transient = (
+                    isinstance(e, (TimeoutError, ConnectionError))
+                    or "timeout" in message
+                    or "connection" in message
+                )
+                if transient and not started and attempt < max_retries:
+                    delay = retry_delay * 2 ** attempt
+                    logger.info("Retrying instruction execution after %ss delay", delay)
+                    await asyncio.sleep(delay)
+                    continue
+                
+                # Final failure
+                yield StatusUpdate.model_construct(
                     session_id=session_id,
                     subtask=None,
-                    overall_status="completed",
-                    message="Task completed (no actions required)",
-                    timestamp=datetime.now()
+                    overall_status="failed",
+                    message=f"ADK agent error: {str(e)}",
+                    window_state="normal",
+                    timestamp=datetime.now(timezone.utc)
                 )
                 return
-            
+    
+    async def execute_plan(
+        self,
+        plan: ExecutionPlan,
+        session_id: str
+    ) -> AsyncIterator[StatusUpdate]:
+        """
+        Replay a cached execution plan without calling Gemini.
+        
+        Yields the same status update stream as execute_instruction, so callers
+        can consume either one interchangeably.
+        
+        Args:
+            plan: Cached plan whose subtasks carry "tool_name" and "tool_args"
+            session_id: Unique session identifier
+        
+        Yields:
+            StatusUpdate: Real-time execution status updates
+        """
+        logger.info("Replaying cached plan for session %s (%s steps)", session_id, len(plan.subtasks))
+        
+        tool_calls = [
+            {"tool": step.get("tool_name"), "args": step.get("tool_args") or {}}
+            for step in plan.subtasks
+        ]
+        
+        async with aclosing(self._execute_tool_calls(_iterate(tool_calls), session_id)) as updates:
+            async for update in updates:
+                yield update
+    
+    async def _execute_tool_calls(
+        self,
+        tool_calls: AsyncIterable[Dict[str, Any]],
+        session_id: str
+    ) -> AsyncIterator[StatusUpdate]:
+        """
+        Run planned tool calls against the desktop, streaming status updates.
+        
+        Holds the desktop lock for the whole run so concurrent sessions never
+        interleave mouse, keyboard or window actions.
+        
+        Args:
+            tool_calls: Parsed tool calls with "tool" and "args" keys, consumed
+                as they become available
+            session_id: Unique session identifier
+        
+        Yields:
+            StatusUpdate: Subtask progress followed by a terminal update
+        """
+        async with self._desktop_lock:
             # Execute each tool call
-            for idx, tool_call in enumerate(tool_calls, 1):
+            idx = 0
+            async for tool_call in tool_calls:
+                idx += 1
                 func_name = tool_call.get("tool")
                 func_args = tool_call.get("args", {})
                 
@@ -210,7 +347,7 @@ Generate the execution plan as a series of tool calls in JSON format:"""
                 app_to_focus = self._should_focus_application(func_name, func_args)
                 if app_to_focus and func_name != "focus_window":
                     # Automatically focus the application if needed
-                    logger.info(f"Auto-focusing application: {app_to_focus}")
+                    logger.info("Auto-focusing application: %s", app_to_focus)
                     focus_func = self.tool_map.get("focus_window")
                     if focus_func:
                         focus_result = focus_func(window_title=app_to_focus)
@@ -232,17 +369,18 @@ Generate the execution plan as a series of tool calls in JSON format:"""
                     status=SubtaskStatus.IN_PROGRESS,
                     tool_name=func_name,
                     tool_args=func_args,
-                    timestamp=datetime.now()
+                    timestamp=datetime.now(timezone.utc)
                 )
                 
-                # Yield status update for subtask start
-                yield StatusUpdate(
+                # Yield status update for subtask start; updates are built from
+                # already-validated values, so model_construct skips validation
+                yield StatusUpdate.model_construct(
                     session_id=session_id,
                     subtask=subtask,
                     overall_status="in_progress",
                     message=f"Starting subtask: {func_name}",
                     window_state="minimal" if idx == 1 else None,  # Minimize on first action
-                    timestamp=datetime.now()
+                    timestamp=datetime.now(timezone.utc)
                 )
                 
                 # Execute the tool function
@@ -263,89 +401,116 @@ Generate the execution plan as a series of tool calls in JSON format:"""
                         subtask.error = result.error
                     
                     # Yield status update for subtask completion
-                    yield StatusUpdate(
+                    yield StatusUpdate.model_construct(
                         session_id=session_id,
                         subtask=subtask,
                         overall_status="in_progress" if result.success else "failed",
                         message=f"Completed subtask: {func_name}" if result.success else f"Failed: {result.error}",
-                        timestamp=datetime.now()
+                        timestamp=datetime.now(timezone.utc)
                     )
                     
                     # If subtask failed, stop execution
                     if not result.success:
-                        logger.error(f"Subtask failed: {result.error}")
+                        logger.error("Subtask failed: %s", result.error)
                         # Send window restore command
-                        yield StatusUpdate(
+                        yield StatusUpdate.model_construct(
                             session_id=session_id,
                             subtask=None,
                             overall_status="failed",
                             message="Execution failed, restoring window",
                             window_state="normal",
-                            timestamp=datetime.now()
+                            timestamp=datetime.now(timezone.utc)
                         )
                         return
                     
                 except Exception as e:
-                    logger.error(f"Error executing tool {func_name}: {e}")
+                    logger.error("Error executing tool %s: %s", func_name, e)
                     subtask.status = SubtaskStatus.FAILED
                     subtask.error = str(e)
                     
-                    yield StatusUpdate(
+                    yield StatusUpdate.model_construct(
                         session_id=session_id,
                         subtask=subtask,
                         overall_status="failed",
                         message=f"Error executing {func_name}: {e}",
                         window_state="normal",
-                        timestamp=datetime.now()
+                        timestamp=datetime.now(timezone.utc)
                     )
                     return
             
             # Final status update with window restore
-            yield StatusUpdate(
+            yield StatusUpdate.model_construct(
                 session_id=session_id,
                 subtask=None,
                 overall_status="completed",
                 message="Task execution completed successfully",
                 window_state="normal",
-                timestamp=datetime.now()
+                timestamp=datetime.now(timezone.utc)
             )
             
-            logger.info(f"Instruction execution completed for session {session_id}")
-            
-        except Exception as e:
-            logger.error(f"Error during instruction execution: {e}")
-            
-            # Retry logic with exponential backoff
-            max_retries = 1
-            retry_delay = 2
-            
-            # Check if we should retry (simple heuristic)
-            if "timeout" in str(e).lower() or "connection" in str(e).lower():
-                logger.info(f"Retrying instruction execution after {retry_delay}s delay")
-                time.sleep(retry_delay)
-                # Recursive retry
-                async for update in self.execute_instruction(instruction, session_id):
-                    yield update
-            else:
-                # Final failure
-                yield StatusUpdate(
-                    session_id=session_id,
-                    subtask=None,
-                    overall_status="failed",
-                    message=f"ADK agent error: {str(e)}",
-                    window_state="normal",
-                    timestamp=datetime.now()
-                )
+            logger.info("Instruction execution completed for session %s", session_id)
     
     def _generate_tool_descriptions(self) -> str:
         """Generate human-readable descriptions of available tools."""
+        if self._tool_descriptions is not None:
+            return self._tool_descriptions
+        
         descriptions = []
         for tool_name, tool_func in self.tool_map.items():
             doc = tool_func.__doc__ or f"Execute {tool_name}"
             # Get first line of docstring
             first_line = doc.strip().split('\n')[0]
             descriptions.append(f"- {tool_name}: {first_line}")
-        return "\n".join(descriptions)
+        self._tool_descriptions = "\n".join(descriptions)
+        return self._tool_descriptions
+    
+    def _build_system_prompt(self, instruction: str) -> str:
+        """
+        Build the planning prompt for an instruction.
+        
+        Args:
+            instruction: Natural language task instruction
+        
+        Returns:
+            Prompt asking Gemini for one JSON tool call per line
+        """
+        # Identify applications mentioned in the instruction
+        identified_apps = self._identify_applications(instruction)
+        
+        # Add multi-app orchestration guidance if multiple apps detected
+        multi_app_guidance = ""
+        if len(identified_apps) > 1:
+            multi_app_guidance = f"""
+
+IMPORTANT - Multi-Application Task Detected:
+This task involves multiple applications: {', '.join(identified_apps)}
+{_MULTI_APP_WORKFLOW}"""
+        
+        # The RPA context and tool descriptions are the same for every task
+        return f"""{self._generate_system_prompt_prefix()}{multi_app_guidance}
+
+Task: {instruction}
+
+Generate the execution plan as a series of tool calls in JSON format:"""
+    
+    def _generate_system_prompt_prefix(self) -> str:
+        """Generate the task-independent start of the planning prompt."""
+        if self._system_prompt_prefix is not None:
+            return self._system_prompt_prefix
+        
+        self._system_prompt_prefix = f"""You are an RPA (Robotic Process Automation) agent that executes desktop automation tasks.
+You have access to the following tools:
+
+{self._generate_tool_descriptions()}
+
+When given a task instruction:
+1. Break it down into clear, sequential subtasks
+2. For each subtask, output a JSON object with the tool to use and its parameters
+3. Format: {{"tool": "tool_name", "args": {{"param1": "value1", "param2": "value2"}}}}
+4. Output one tool call per line
+5. Be specific with coordinates, text, and parameters
+"""
+        return self._system_prompt_prefix
     
     def _identify_applications(self, instruction: str) -> List[str]:
         """
@@ -355,37 +520,17 @@ Generate the execution plan as a series of tool calls in JSON format:"""
             instruction: Natural language task instruction
         
         Returns:
-            List of identified application names
+            List of identified application names, in order of first mention
         
         Validates: Requirements 11.1
         """
-        # Common application keywords
-        app_keywords = {
-            "notepad": ["notepad"],
-            "chrome": ["chrome", "browser", "google chrome"],
-            "firefox": ["firefox", "mozilla"],
-            "edge": ["edge", "microsoft edge"],
-            "outlook": ["outlook", "email"],
-            "excel": ["excel", "spreadsheet"],
-            "word": ["word", "document"],
-            "powerpoint": ["powerpoint", "presentation", "slides"],
-            "calculator": ["calculator", "calc"],
-            "explorer": ["explorer", "file explorer", "files"],
-            "cmd": ["cmd", "command prompt", "terminal"],
-            "paint": ["paint", "mspaint"]
-        }
-        
-        instruction_lower = instruction.lower()
-        identified_apps = []
-        
-        for app_name, keywords in app_keywords.items():
-            for keyword in keywords:
-                if keyword in instruction_lower:
-                    if app_name not in identified_apps:
-                        identified_apps.append(app_name)
-                    break
-        
-        logger.info(f"Identified applications in instruction: {identified_apps}")
+        # A dict keeps the first-seen order while dropping repeats
+        identified = {}
+        for match in _APP_KEYWORD_PATTERN.finditer(instruction.lower()):
+            identified.setdefault(_KEYWORD_TO_APP[match.group()], None)
+        identified_apps = list(identified)
+        
+        logger.info("Identified applications in instruction: %s", identified_apps)
         return identified_apps
     
     def _update_active_application(self, app_name: str) -> None:
@@ -407,7 +552,7 @@ Generate the execution plan as a series of tool calls in JSON format:"""
         self.application_context[app_name]["last_accessed"] = datetime.now()
         self.application_context[app_name]["action_count"] += 1
         
-        logger.debug(f"Active application updated to: {app_name}")
+        logger.debug("Active application updated to: %s", app_name)
     
     def _should_focus_application(self, tool_name: str, tool_args: Dict[str, Any]) -> Optional[str]:
         """
@@ -435,59 +580,65 @@ Generate the execution plan as a series of tool calls in JSON format:"""
         # Return current active application if set
         return self.active_application
     
-    def _parse_tool_calls(self, response_text: str) -> List[Dict[str, Any]]:
+    def _parse_single_tool_call(self, line: str) -> Optional[Dict[str, Any]]:
         """
-        Parse tool calls from Gemini response text.
-        
-        Extracts JSON objects representing tool calls from the response.
+        Parse one line of a Gemini response as a tool call.
         
         Args:
-            response_text: Raw text response from Gemini
+            line: One line of response text
         
         Returns:
-            List of tool call dictionaries
+            Tool call dictionary, or None if the line holds no tool call
         """
-        tool_calls = []
-        
-        # Split by lines and try to parse each line as JSON
-        lines = response_text.split('\n')
-        for line in lines:
-            line = line.strip()
-            if not line or not line.startswith('{'):
-                continue
-            
+        line = line.strip()
+        if not line or not line.startswith('{'):
+            return None
+        
+        try:
+            # Try to parse as JSON
+            obj = json.loads(line)
+        except json.JSONDecodeError:
+            # Try to extract JSON from the line
+            # Look for {...} pattern
+            match = _JSON_OBJECT_PATTERN.search(line)
+            if not match:
+                return None
             try:
-                # Try to parse as JSON
-                obj = json.loads(line)
-                if isinstance(obj, dict) and "tool" in obj:
-                    tool_calls.append(obj)
+                obj = json.loads(match.group())
             except json.JSONDecodeError:
-                # Try to extract JSON from the line
-                # Look for {...} pattern
-                match = re.search(r'\{.*\}', line)
-                if match:
-                    try:
-                        obj = json.loads(match.group())
-                        if isinstance(obj, dict) and "tool" in obj:
-                            tool_calls.append(obj)
-                    except json.JSONDecodeError:
-                        continue
-        
-        # If no JSON found, try to extract from code blocks
-        if not tool_calls:
-            code_block_pattern = r'```(?:json)?\s*(\{.*?\})\s*```'
-            code_matches = re.findall(code_block_pattern, response_text, re.DOTALL)
-            for match in code_matches:
-                try:
-                    # Try to parse each line in the code block
-                    for line in match.split('\n'):
-                        line = line.strip()
-                        if line.startswith('{'):
-                            obj = json.loads(line)
-                            if isinstance(obj, dict) and "tool" in obj:
-                                tool_calls.append(obj)
-                except json.JSONDecodeError:
-                    continue
+                return None
+        
+        if isinstance(obj, dict) and "tool" in obj:
+            return obj
+        return None
+    
+    async def _stream_tool_calls(self, response: AsyncIterable[Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Parse tool calls from a streamed Gemini response as lines complete.
+        
+        Every tool call sits on its own line, including those inside code
+        blocks, so complete lines are parsed as soon as they arrive.
         
-        logger.info(f"Parsed {len(tool_calls)} tool calls from response")
-        return tool_calls
+        Args:
+            response: Streamed response yielding chunks with a text attribute
+        
+        Yields:
+            Tool call dictionaries in response order
+        """
+        count = 0
+        pending = ""
+        async for chunk in response:
+            pending += chunk.text
+            *lines, pending = pending.split('\n')
+            for line in lines:
+                tool_call = self._parse_single_tool_call(line)
+                if tool_call is not None:
+                    count += 1
+                    yield tool_call
+        
+        tool_call = self._parse_single_tool_call(pending)
+        if tool_call is not None:
+            count += 1
+            yield tool_call
+        
+        logger.info("Parsed %s tool calls from response", count)
@@ -9,7 +9,7 @@ Validates: Requirement 1.1
 """
 
 import os
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -39,6 +39,8 @@ class Config:
     HOST: str
     PORT: int
     LOG_LEVEL: str
+    RELOAD: bool
+    CORS_ORIGINS: List[str]
     
     # Storage Configuration
     HISTORY_DIR: Path
@@ -49,6 +51,7 @@ class Config:
     MAX_CONCURRENT_SESSIONS: int
     REQUEST_QUEUE_SIZE: int
     WEBSOCKET_PING_INTERVAL: int
+    PLAN_CACHE_FLUSH_INTERVAL: float
     
     # Optional Configuration
     USE_JSON_LOGS: bool
@@ -72,6 +75,12 @@ class Config:
         self.HOST = os.getenv("HOST", "0.0.0.0")
         self.PORT = int(os.getenv("PORT", "8000"))
         self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+        self.RELOAD = os.getenv("RELOAD", "false").lower() == "true"
+        self.CORS_ORIGINS = [
+            origin.strip()
+            for origin in os.getenv("CORS_ORIGINS", "*").split(",")
+            if origin.strip()
+        ]
         
         # Storage Configuration
         self.HISTORY_DIR = Path(os.getenv("HISTORY_DIR", "./data/history"))
@@ -82,6 +91,7 @@ class Config:
         self.MAX_CONCURRENT_SESSIONS = int(os.getenv("MAX_CONCURRENT_SESSIONS", "1"))
         self.REQUEST_QUEUE_SIZE = int(os.getenv("REQUEST_QUEUE_SIZE", "10"))
         self.WEBSOCKET_PING_INTERVAL = int(os.getenv("WEBSOCKET_PING_INTERVAL", "30"))
+        self.PLAN_CACHE_FLUSH_INTERVAL = float(os.getenv("PLAN_CACHE_FLUSH_INTERVAL", "5"))
         
         # Optional Configuration
         self.USE_JSON_LOGS = os.getenv("USE_JSON_LOGS", "false").lower() == "true"
@@ -110,6 +120,9 @@ class Config:
         if self.PORT < 1 or self.PORT > 65535:
             errors.append(f"PORT must be between 1 and 65535, got: {self.PORT}")
         
+        if not self.CORS_ORIGINS:
+            errors.append("CORS_ORIGINS must list at least one origin")
+        
         valid_log_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
         if self.LOG_LEVEL not in valid_log_levels:
             errors.append(
@@ -136,6 +149,11 @@ class Config:
                 f"WEBSOCKET_PING_INTERVAL must be positive, got: {self.WEBSOCKET_PING_INTERVAL}"
             )
         
+        if self.PLAN_CACHE_FLUSH_INTERVAL <= 0:
+            errors.append(
+                f"PLAN_CACHE_FLUSH_INTERVAL must be positive, got: {self.PLAN_CACHE_FLUSH_INTERVAL}"
+            )
+        
         # Raise exception if any validation errors
         if errors:
             error_message = "Configuration validation failed:\n" + "\n".join(f"  - {e}" for e in errors)
@@ -165,7 +183,9 @@ class Config:
             "server": {
                 "host": self.HOST,
                 "port": self.PORT,
-                "log_level": self.LOG_LEVEL
+                "log_level": self.LOG_LEVEL,
+                "reload": self.RELOAD,
+                "cors_origins": self.CORS_ORIGINS
             },
             "storage": {
                 "history_dir": str(self.HISTORY_DIR),
@@ -175,7 +195,8 @@ class Config:
             "performance": {
                 "max_concurrent_sessions": self.MAX_CONCURRENT_SESSIONS,
                 "request_queue_size": self.REQUEST_QUEUE_SIZE,
-                "websocket_ping_interval": self.WEBSOCKET_PING_INTERVAL
+                "websocket_ping_interval": self.WEBSOCKET_PING_INTERVAL,
+                "plan_cache_flush_interval": self.PLAN_CACHE_FLUSH_INTERVAL
             }
         }
 
@@ -175,6 +175,31 @@ class InvalidSessionStateError(ClientError):
         )
 
 
+class QueueFullError(ClientError):
+    """Exception raised when the execution queue cannot accept more sessions."""
+    
+    def __init__(
+        self,
+        queue_size: int,
+        details: Optional[str] = None,
+        retry_after: int = 5
+    ):
+        """
+        Initialize queue full error.
+        
+        Args:
+            queue_size: Maximum number of queued sessions
+            details: Additional details
+            retry_after: Seconds the client should wait before retrying
+        """
+        super().__init__(
+            message="Execution queue is full, retry later",
+            details=details,
+            context={"queue_size": queue_size}
+        )
+        self.retry_after = retry_after
+
+
 # System Errors (HTTP 500)
 
 class SystemError(AEGISException):
@@ -5,11 +5,15 @@ This module provides persistent storage for execution sessions, allowing
 retrieval of past automation runs for review and debugging.
 """
 
-import json
+import heapq
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from pathlib import Path
+from collections import OrderedDict
+from threading import Lock
+
+import orjson
 
 from src.models import ExecutionSession, SessionSummary
 from src.config import get_config
@@ -20,15 +24,21 @@ class HistoryStore:
     Manages persistent storage of execution sessions.
     
     Sessions are stored as individual JSON files in the history directory,
-    with an index file for quick lookups and ordering.
+    with an index file for quick lookups and ordering. Recently read sessions
+    and history listings are kept in memory so repeated lookups skip the disk;
+    a version counter bumped on every save lets callers detect changes.
     """
     
-    def __init__(self, history_dir: Optional[Path] = None):
+    # Number of distinct history limits cached at once
+    SUMMARIES_CACHE_SIZE = 8
+    
+    def __init__(self, history_dir: Optional[Path] = None, details_cache_size: int = 128):
         """
         Initialize the HistoryStore.
         
         Args:
             history_dir: Directory path for storing session files (defaults to config.HISTORY_DIR)
+            details_cache_size: Maximum number of parsed sessions kept in memory
         """
         config = get_config()
         if history_dir is None:
@@ -38,6 +48,17 @@ class HistoryStore:
             self.history_dir = Path(history_dir) if isinstance(history_dir, str) else history_dir
         self.index_file = self.history_dir / "index.json"
         
+        # LRU cache of parsed sessions, keyed by session_id
+        self.details_cache_size = details_cache_size
+        self._details_cache: OrderedDict[str, ExecutionSession] = OrderedDict()
+        
+        # History listings keyed by limit, valid until the next save
+        self._summaries_cache: Dict[int, List[SessionSummary]] = {}
+        self._version = 0
+        
+        # Guards the files, index and cache; methods may be called from worker threads
+        self._lock = Lock()
+        
         # Ensure directory exists
         self.history_dir.mkdir(parents=True, exist_ok=True)
         
@@ -52,15 +73,23 @@ class HistoryStore:
         Args:
             session: The ExecutionSession to save
         """
-        # Save session to individual file
-        session_file = self.history_dir / f"{session.session_id}.json"
-        session_data = session.model_dump(mode='json')
-        
-        with open(session_file, 'w', encoding='utf-8') as f:
-            json.dump(session_data, f, indent=2, default=str)
-        
-        # Update index
-        self._update_index(session)
+        with self._lock:
+            # Save session to individual file
+            session_file = self.history_dir / f"{session.session_id}.json"
+            session_file.write_bytes(session.model_dump_json(indent=2).encode('utf-8'))
+        
+            # Update index
+            self._update_index(session)
+        
+            # Drop any stale cached copy; the next read reloads the saved state
+            self._details_cache.pop(session.session_id, None)
+            self._summaries_cache.clear()
+            self._version += 1
+    
+    @property
+    def version(self) -> int:
+        """Number of saves since this store was created."""
+        return self._version
     
     def get_all_sessions(self, limit: int = 100) -> List[SessionSummary]:
         """
@@ -72,18 +101,20 @@ class HistoryStore:
         Returns:
             List of SessionSummary objects, newest first
         """
-        index = self._read_index()
-        
-        # Sort by created_at descending (newest first)
-        sorted_index = sorted(
+        with self._lock:
+            cached = self._summaries_cache.get(limit)
+            if cached is not None:
+                return list(cached)
+            version = self._version
+            index = self._read_index()
+        
+        # Select the newest entries without sorting the whole index
+        limited_index = heapq.nlargest(
+            limit,
             index,
-            key=lambda x: x.get('created_at', ''),
-            reverse=True
+            key=lambda x: x.get('created_at', '')
         )
         
-        # Apply limit
-        limited_index = sorted_index[:limit]
-        
         # Convert to SessionSummary objects
         summaries = []
         for entry in limited_index:
@@ -101,7 +132,33 @@ class HistoryStore:
                 # Skip malformed entries
                 continue
         
-        return summaries
+        with self._lock:
+            # Only cache if no save happened while the index was being parsed
+            if version == self._version:
+                if len(self._summaries_cache) >= self.SUMMARIES_CACHE_SIZE:
+                    self._summaries_cache.pop(next(iter(self._summaries_cache)))
+                self._summaries_cache[limit] = summaries
+        
+        return list(summaries)
+    
+    def get_cached_session_details(self, session_id: str) -> Optional[ExecutionSession]:
+        """
+        Return a session only if it is already parsed in memory.
+        
+        Never touches the disk, so it is cheap enough to call from the
+        event loop before falling back to get_session_details().
+        
+        Args:
+            session_id: The unique session identifier
+            
+        Returns:
+            ExecutionSession if cached, None otherwise
+        """
+        with self._lock:
+            cached = self._details_cache.get(session_id)
+            if cached is not None:
+                self._details_cache.move_to_end(session_id)
+            return cached
     
     def get_session_details(self, session_id: str) -> Optional[ExecutionSession]:
         """
@@ -113,29 +170,29 @@ class HistoryStore:
         Returns:
             ExecutionSession if found, None otherwise
         """
-        session_file = self.history_dir / f"{session_id}.json"
+        with self._lock:
+            cached = self._details_cache.get(session_id)
+            if cached is not None:
+                self._details_cache.move_to_end(session_id)
+                return cached
         
-        if not session_file.exists():
-            return None
+            session_file = self.history_dir / f"{session_id}.json"
         
-        try:
-            with open(session_file, 'r', encoding='utf-8') as f:
-                session_data = json.load(f)
-            
-            # Convert datetime strings back to datetime objects
-            session_data['created_at'] = datetime.fromisoformat(session_data['created_at'])
-            session_data['updated_at'] = datetime.fromisoformat(session_data['updated_at'])
-            if session_data.get('completed_at'):
-                session_data['completed_at'] = datetime.fromisoformat(session_data['completed_at'])
-            
-            # Convert subtask timestamps
-            for subtask in session_data.get('subtasks', []):
-                subtask['timestamp'] = datetime.fromisoformat(subtask['timestamp'])
-            
-            return ExecutionSession(**session_data)
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
-            # Return None for corrupted files
-            return None
+            if not session_file.exists():
+                return None
+        
+            try:
+                # Parsed and validated in one pass, datetimes included
+                session = ExecutionSession.model_validate_json(session_file.read_bytes())
+            except ValueError as e:
+                # Return None for corrupted files
+                return None
+        
+            self._details_cache[session_id] = session
+            if len(self._details_cache) > self.details_cache_size:
+                self._details_cache.popitem(last=False)
+        
+            return session
     
     def _read_index(self) -> List[dict]:
         """
@@ -145,9 +202,8 @@ class HistoryStore:
             List of index entries
         """
         try:
-            with open(self.index_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
+            return orjson.loads(self.index_file.read_bytes())
+        except (orjson.JSONDecodeError, FileNotFoundError):
             return []
     
     def _write_index(self, index: List[dict]) -> None:
@@ -157,8 +213,7 @@ class HistoryStore:
         Args:
             index: List of index entries to write
         """
-        with open(self.index_file, 'w', encoding='utf-8') as f:
-            json.dump(index, f, indent=2, default=str)
+        self.index_file.write_bytes(orjson.dumps(index, option=orjson.OPT_INDENT_2))
     
     def _update_index(self, session: ExecutionSession) -> None:
         """
@@ -101,6 +101,7 @@ class SessionLogger:
         self,
         level: int,
         message: str,
+        args: tuple = (),
         session_id: Optional[str] = None,
         extra_data: Optional[Dict[str, Any]] = None,
         exc_info: bool = False
@@ -110,11 +111,16 @@ class SessionLogger:
         
         Args:
             level: Log level
-            message: Log message
+            message: Log message, optionally with %-style placeholders
+            args: Arguments merged into the message only if the record is emitted
             session_id: Optional session ID (overrides context)
             extra_data: Optional extra data to include
             exc_info: Whether to include exception info
         """
+        # Skip the context switch and extra dict for filtered-out levels
+        if not self.logger.isEnabledFor(level):
+            return
+        
         # Use provided session_id or get from context
         if session_id:
             token = current_session_id.set(session_id)
@@ -125,7 +131,7 @@ class SessionLogger:
             extra['extra_data'] = extra_data
         
         # Log the message
-        self.logger.log(level, message, extra=extra, exc_info=exc_info)
+        self.logger.log(level, message, *args, extra=extra, exc_info=exc_info)
         
         # Reset context if we set it
         if session_id:
@@ -134,49 +140,54 @@ class SessionLogger:
     def debug(
         self,
         message: str,
+        *args: Any,
         session_id: Optional[str] = None,
         extra_data: Optional[Dict[str, Any]] = None
     ):
         """Log debug message with session context."""
-        self._log(logging.DEBUG, message, session_id, extra_data)
+        self._log(logging.DEBUG, message, args, session_id, extra_data)
     
     def info(
         self,
         message: str,
+        *args: Any,
         session_id: Optional[str] = None,
         extra_data: Optional[Dict[str, Any]] = None
     ):
         """Log info message with session context."""
-        self._log(logging.INFO, message, session_id, extra_data)
+        self._log(logging.INFO, message, args, session_id, extra_data)
     
     def warning(
         self,
         message: str,
+        *args: Any,
         session_id: Optional[str] = None,
         extra_data: Optional[Dict[str, Any]] = None
     ):
         """Log warning message with session context."""
-        self._log(logging.WARNING, message, session_id, extra_data)
+        self._log(logging.WARNING, message, args, session_id, extra_data)
     
     def error(
         self,
         message: str,
+        *args: Any,
         session_id: Optional[str] = None,
         extra_data: Optional[Dict[str, Any]] = None,
         exc_info: bool = True
     ):
         """Log error message with session context and exception info."""
-        self._log(logging.ERROR, message, session_id, extra_data, exc_info)
+        self._log(logging.ERROR, message, args, session_id, extra_data, exc_info)
     
     def critical(
         self,
         message: str,
+        *args: Any,
         session_id: Optional[str] = None,
         extra_data: Optional[Dict[str, Any]] = None,
         exc_info: bool = True
     ):
         """Log critical message with session context and exception info."""
-        self._log(logging.CRITICAL, message, session_id, extra_data, exc_info)
+        self._log(logging.CRITICAL, message, args, session_id, extra_data, exc_info)
 
 
 def setup_logging(
@@ -22,6 +22,7 @@ class TaskInstructionResponse(BaseModel):
     session_id: str
     status: Literal["pending", "in_progress"]
     message: str
+    queue_position: Optional[int] = None
 
 
 class SubtaskStatus(str, Enum):
@@ -44,6 +45,11 @@ class Subtask(BaseModel):
     timestamp: datetime
 
 
+# Session statuses that can still change, and those that end a session
+ACTIVE_STATUSES = frozenset({"pending", "in_progress"})
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
+
 class ExecutionSession(BaseModel):
     """Model representing a complete execution session."""
     session_id: str
@@ -100,6 +106,27 @@ class ExecutionPlan(BaseModel):
     subtasks: List[dict]
     estimated_duration: Optional[int] = None
     created_at: datetime
+    
+    @classmethod
+    def from_session(cls, session: ExecutionSession) -> "ExecutionPlan":
+        """
+        Build a replayable plan from the subtasks a session executed.
+        
+        Only the tool call of each subtask is kept. The plan is built with
+        model_construct, because the subtasks were validated when recorded.
+        """
+        return cls.model_construct(
+            instruction=session.instruction,
+            subtasks=[
+                {
+                    "tool_name": subtask.tool_name,
+                    "tool_args": subtask.tool_args,
+                    "description": subtask.description
+                }
+                for subtask in session.subtasks
+            ],
+            created_at=datetime.now()
+        )
 
 
 class ToolResult(BaseModel):
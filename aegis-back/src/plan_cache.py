@@ -6,16 +6,22 @@ unnecessary calls to the ADK agent. It uses embedding-based similarity
 matching with cosine similarity and LRU eviction policy.
 """
 
-import json
+import asyncio
 import hashlib
+import logging
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Tuple
 from pathlib import Path
 from collections import OrderedDict
+from threading import Lock
+
+import orjson
 
 from src.models import ExecutionPlan
 from src.config import get_config
 
+logger = logging.getLogger(__name__)
+
 
 class PlanCache:
     """
@@ -55,6 +61,11 @@ class PlanCache:
         # Key: instruction hash, Value: (ExecutionPlan, embedding, timestamp)
         self._cache: OrderedDict[str, Tuple[ExecutionPlan, list, datetime]] = OrderedDict()
         
+        # Guards the cache and its file; methods may be called from worker threads
+        self._lock = Lock()
+        # Set when memory holds changes not yet written by flush()
+        self._dirty = False
+        
         # Ensure cache directory exists
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
@@ -75,32 +86,33 @@ class PlanCache:
         Returns:
             ExecutionPlan if cache hit, None otherwise
         """
-        # Clean up expired entries first
-        self._cleanup_expired()
-        
         if not instruction or not instruction.strip():
             return None
         
         # Compute embedding for the instruction
         query_embedding = self._compute_embedding(instruction)
         
-        # Search for similar instruction in cache
-        best_match_key = None
-        best_similarity = 0.0
-        
-        for cache_key, (plan, cached_embedding, timestamp) in self._cache.items():
-            similarity = self.compute_similarity(query_embedding, cached_embedding)
+        with self._lock:
+            # Clean up expired entries first
+            self._cleanup_expired()
             
-            if similarity > best_similarity:
-                best_similarity = similarity
-                best_match_key = cache_key
-        
-        # Check if best match exceeds threshold
-        if best_similarity >= self.similarity_threshold and best_match_key:
-            # Move to end for LRU (most recently used)
-            self._cache.move_to_end(best_match_key)
-            plan, _, _ = self._cache[best_match_key]
-            return plan
+            # Search for similar instruction in cache
+            best_match_key = None
+            best_similarity = 0.0
+            
+            for cache_key, (plan, cached_embedding, timestamp) in self._cache.items():
+                similarity = self.compute_similarity(query_embedding, cached_embedding)
+                
+                if similarity > best_similarity:
+                    best_similarity = similarity
+                    best_match_key = cache_key
+            
+            # Check if best match exceeds threshold
+            if best_similarity >= self.similarity_threshold and best_match_key:
+                # Move to end for LRU (most recently used)
+                self._cache.move_to_end(best_match_key)
+                plan, _, _ = self._cache[best_match_key]
+                return plan
         
         return None
     
@@ -109,7 +121,8 @@ class PlanCache:
         Store execution plan with instruction key.
         
         Computes embedding for the instruction and stores the plan with
-        LRU eviction if cache is full.
+        LRU eviction if cache is full. The change is written to disk by the
+        next flush().
         
         Args:
             instruction: The task instruction
@@ -122,19 +135,19 @@ class PlanCache:
         embedding = self._compute_embedding(instruction)
         cache_key = self._compute_hash(instruction)
         
-        # Store in cache with timestamp
-        self._cache[cache_key] = (plan, embedding, datetime.now())
-        
-        # Move to end for LRU (most recently used)
-        self._cache.move_to_end(cache_key)
-        
-        # Evict oldest entry if cache exceeds max size
-        if len(self._cache) > self.max_size:
-            # Remove oldest (first) item
-            self._cache.popitem(last=False)
-        
-        # Persist to disk
-        self._save_cache()
+        with self._lock:
+            # Store in cache with timestamp
+            self._cache[cache_key] = (plan, embedding, datetime.now())
+            
+            # Move to end for LRU (most recently used)
+            self._cache.move_to_end(cache_key)
+            
+            # Evict oldest entry if cache exceeds max size
+            if len(self._cache) > self.max_size:
+                # Remove oldest (first) item
+                self._cache.popitem(last=False)
+            
+            self._dirty = True
     
     def compute_similarity(
         self,
@@ -184,8 +197,39 @@ class PlanCache:
     
     def clear_cache(self) -> None:
         """Clear all cached plans from memory and disk."""
-        self._cache.clear()
-        self._save_cache()
+        with self._lock:
+            self._cache.clear()
+            self._save_cache()
+    
+    def flush(self) -> bool:
+        """
+        Write pending cache changes to disk.
+        
+        Returns:
+            True if the cache file was written, False if nothing had changed
+        """
+        with self._lock:
+            if not self._dirty:
+                return False
+            self._save_cache()
+            return True
+    
+    async def run_flusher(self, interval: float) -> None:
+        """
+        Flush pending changes every interval seconds until cancelled.
+        
+        A failed write is logged and retried on the next interval, since
+        the changes stay pending in memory.
+        
+        Args:
+            interval: Seconds between flushes
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error("Failed to flush plan cache: %s", e)
     
     def _compute_embedding(self, text: str) -> list:
         """
@@ -201,7 +245,7 @@ class PlanCache:
             Embedding vector as list of floats
         """
         # Normalize text
-        text = text.lower().strip()
+        text = self._normalize(text)
         
         # Simple character n-gram based embedding (placeholder)
         # In production, replace with proper embedding model
@@ -239,7 +283,22 @@ class PlanCache:
         Returns:
             Hash string
         """
-        return hashlib.sha256(text.encode()).hexdigest()
+        return hashlib.sha256(self._normalize(text).encode()).hexdigest()
+    
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """
+        Normalize instruction text so trivially different phrasings share a key.
+        
+        Lowercases and collapses runs of whitespace.
+        
+        Args:
+            text: Text to normalize
+            
+        Returns:
+            Normalized text
+        """
+        return " ".join(text.lower().split())
     
     def _cleanup_expired(self) -> None:
         """Remove expired entries from cache."""
@@ -254,7 +313,7 @@ class PlanCache:
             del self._cache[key]
         
         if expired_keys:
-            self._save_cache()
+            self._dirty = True
     
     def _save_cache(self) -> None:
         """Persist cache to disk."""
@@ -270,8 +329,8 @@ class PlanCache:
             }
         
         # Write to file
-        with open(cache_file, 'w') as f:
-            json.dump(cache_data, f, indent=2)
+        cache_file.write_bytes(orjson.dumps(cache_data, option=orjson.OPT_INDENT_2))
+        self._dirty = False
     
     def _load_cache(self) -> None:
         """Load cache from disk."""
@@ -281,8 +340,7 @@ class PlanCache:
             return
         
         try:
-            with open(cache_file, 'r') as f:
-                cache_data = json.load(f)
+            cache_data = orjson.loads(cache_file.read_bytes())
             
             # Reconstruct cache
             for key, data in cache_data.items():
@@ -295,7 +353,7 @@ class PlanCache:
             # Clean up expired entries
             self._cleanup_expired()
             
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
+        except (KeyError, ValueError) as e:
             # If cache file is corrupted, start fresh
             print(f"Warning: Failed to load cache from disk: {e}")
             self._cache.clear()
@@ -12,6 +12,11 @@ from typing import Optional
 from src.models import ValidationResult
 
 
+# Compiled once; these run on every submitted instruction
+_ALPHANUMERIC = re.compile(r'[a-zA-Z0-9]')
+_WHITESPACE_RUN = re.compile(r'\s+')
+
+
 class PreProcessor:
     """
     Pre-processing layer that validates and sanitizes task instructions
@@ -84,7 +89,7 @@ class PreProcessor:
             )
         
         # Check for malformed content (only special characters, no alphanumeric)
-        if not re.search(r'[a-zA-Z0-9]', stripped_instruction):
+        if not _ALPHANUMERIC.search(stripped_instruction):
             return ValidationResult(
                 is_valid=False,
                 error_message="Instruction must contain at least one alphanumeric character"
@@ -120,18 +125,17 @@ class PreProcessor:
         if not instruction:
             return ""
         
-        # Remove control characters (except common whitespace)
-        # Keep spaces, tabs, newlines temporarily for normalization
-        sanitized = ''.join(
-            char if char.isprintable() or char in [' ', '\t', '\n', '\r'] else ' '
-            for char in instruction
-        )
-        
-        # Normalize line breaks and tabs to spaces
-        sanitized = sanitized.replace('\n', ' ').replace('\r', ' ').replace('\t', ' ')
+        # Replace control characters, line breaks and tabs with spaces; the
+        # per-character pass is skipped for the usual fully printable input
+        sanitized = instruction
+        if not sanitized.isprintable():
+            sanitized = ''.join(
+                char if char.isprintable() else ' '
+                for char in sanitized
+            )
         
         # Normalize multiple spaces to single space
-        sanitized = re.sub(r'\s+', ' ', sanitized)
+        sanitized = _WHITESPACE_RUN.sub(' ', sanitized)
         
         # Strip leading and trailing whitespace
         sanitized = sanitized.strip()
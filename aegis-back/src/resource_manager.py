@@ -37,7 +37,21 @@ class ResourceManager:
         self.session_id = session_id
         self.resources: List[dict] = []
         self._cleanup_handlers: List[Callable] = []
-        logger.debug(f"ResourceManager initialized", session_id=session_id)
+        logger.debug("ResourceManager initialized", session_id=session_id)
+    
+    def reset(self, session_id: str):
+        """
+        Rebind the manager to a new session so it can be reused.
+        
+        Resources still registered are dropped without cleanup, so call
+        cleanup_all() first if the previous session may have left any.
+        
+        Args:
+            session_id: Session ID for context
+        """
+        self.session_id = session_id
+        self.resources.clear()
+        self._cleanup_handlers.clear()
     
     def register_resource(
         self,
@@ -65,7 +79,7 @@ class ResourceManager:
         self.resources.append(resource)
         
         logger.debug(
-            f"Registered resource: {resource_type}:{resource_id}",
+            "Registered resource: %s:%s", resource_type, resource_id,
             session_id=self.session_id,
             extra_data={"resource_type": resource_type, "resource_id": resource_id}
         )
@@ -85,7 +99,7 @@ class ResourceManager:
             if resource["type"] == resource_type and resource["id"] == resource_id:
                 self.resources.pop(i)
                 logger.debug(
-                    f"Unregistered resource: {resource_type}:{resource_id}",
+                    "Unregistered resource: %s:%s", resource_type, resource_id,
                     session_id=self.session_id
                 )
                 return True
@@ -99,7 +113,7 @@ class ResourceManager:
             suppress_errors: Whether to suppress cleanup errors (default: True)
         """
         logger.info(
-            f"Cleaning up {len(self.resources)} resources",
+            "Cleaning up %s resources", len(self.resources),
             session_id=self.session_id
         )
         
@@ -117,7 +131,7 @@ class ResourceManager:
                     cleanup_func()
                 
                 logger.debug(
-                    f"Cleaned up resource: {resource['type']}:{resource['id']}",
+                    "Cleaned up resource: %s:%s", resource['type'], resource['id'],
                     session_id=self.session_id
                 )
                 
@@ -148,7 +162,7 @@ class ResourceManager:
             raise errors[0]  # Raise the first error
         
         logger.info(
-            f"Resource cleanup complete",
+            "Resource cleanup complete",
             session_id=self.session_id,
             extra_data={"error_count": len(errors)}
         )
@@ -161,7 +175,7 @@ class ResourceManager:
             suppress_errors: Whether to suppress cleanup errors
         """
         logger.info(
-            f"Cleaning up {len(self.resources)} resources (sync)",
+            "Cleaning up %s resources (sync)", len(self.resources),
             session_id=self.session_id
         )
         
@@ -175,12 +189,12 @@ class ResourceManager:
                 if not asyncio.iscoroutinefunction(cleanup_func):
                     cleanup_func()
                     logger.debug(
-                        f"Cleaned up resource: {resource['type']}:{resource['id']}",
+                        "Cleaned up resource: %s:%s", resource['type'], resource['id'],
                         session_id=self.session_id
                     )
                 else:
                     logger.warning(
-                        f"Skipping async cleanup in sync context: {resource['type']}:{resource['id']}",
+                        "Skipping async cleanup in sync context: %s:%s", resource['type'], resource['id'],
                         session_id=self.session_id
                     )
                 
@@ -251,7 +265,7 @@ async def managed_resource(
             
         except Exception as e:
             logger.error(
-                f"Error cleaning up resource {resource_type}:{resource_id}: {e}",
+                "Error cleaning up resource %s:%s: %s", resource_type, resource_id, e,
                 session_id=resource_manager.session_id
             )
 
@@ -292,7 +306,7 @@ def managed_resource_sync(
             resource_manager.unregister_resource(resource_type, resource_id)
         except Exception as e:
             logger.error(
-                f"Error cleaning up resource {resource_type}:{resource_id}: {e}",
+                "Error cleaning up resource %s:%s: %s", resource_type, resource_id, e,
                 session_id=resource_manager.session_id
             )
 
@@ -331,14 +345,14 @@ class TimeoutManager:
         """
         try:
             logger.debug(
-                f"Starting operation with {timeout}s timeout: {operation_name}",
+                "Starting operation with %ss timeout: %s", timeout, operation_name,
                 session_id=session_id
             )
             
             result = await asyncio.wait_for(coro, timeout=timeout)
             
             logger.debug(
-                f"Operation completed within timeout: {operation_name}",
+                "Operation completed within timeout: %s", operation_name,
                 session_id=session_id
             )
             
@@ -346,7 +360,7 @@ class TimeoutManager:
             
         except asyncio.TimeoutError:
             logger.error(
-                f"Operation timed out after {timeout}s: {operation_name}",
+                "Operation timed out after %ss: %s", timeout, operation_name,
                 session_id=session_id,
                 extra_data={
                     "operation": operation_name,
@@ -384,7 +398,7 @@ class TimeoutManager:
         start_time = time.time()
         
         logger.debug(
-            f"Starting sync operation with {timeout}s timeout: {operation_name}",
+            "Starting sync operation with %ss timeout: %s", timeout, operation_name,
             session_id=session_id
         )
         
@@ -393,13 +407,13 @@ class TimeoutManager:
                 result = func()
                 if result:
                     logger.debug(
-                        f"Sync operation completed: {operation_name}",
+                        "Sync operation completed: %s", operation_name,
                         session_id=session_id
                     )
                     return result
             except Exception as e:
                 logger.debug(
-                    f"Sync operation check failed: {operation_name} - {e}",
+                    "Sync operation check failed: %s - %s", operation_name, e,
                     session_id=session_id
                 )
             
@@ -408,7 +422,7 @@ class TimeoutManager:
         # Timeout reached
         elapsed = time.time() - start_time
         logger.error(
-            f"Sync operation timed out after {elapsed:.1f}s: {operation_name}",
+            "Sync operation timed out after %.1fs: %s", elapsed, operation_name,
             session_id=session_id,
             extra_data={
                 "operation": operation_name,
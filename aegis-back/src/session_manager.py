@@ -14,6 +14,7 @@ from typing import Optional, Dict, List
 from threading import Lock
 
 from src.models import (
+    ACTIVE_STATUSES,
     ExecutionSession,
     Subtask,
     SubtaskStatus,
@@ -197,7 +198,7 @@ class SessionManager:
                 return False
             
             # Only cancel if session is in progress or pending
-            if session.status in ["pending", "in_progress"]:
+            if session.status in ACTIVE_STATUSES:
                 session.status = "cancelled"
                 session.updated_at = datetime.now(timezone.utc)
                 session.completed_at = datetime.now(timezone.utc)
@@ -245,5 +246,5 @@ class SessionManager:
         session = self.get_session(session_id)
         if not session:
             return False
-        return session.status in ["pending", "in_progress"]
+        return session.status in ACTIVE_STATUSES
 
@@ -7,11 +7,12 @@ and window state commands.
 """
 
 from fastapi import WebSocket, WebSocketDisconnect
-from typing import Dict, List, Optional, Literal
-from datetime import datetime
-import json
+from typing import Deque, Dict, List, Optional, Literal, Tuple
+from datetime import datetime, timezone
+import asyncio
+from collections import OrderedDict, deque
 import logging
-from src.models import StatusUpdate
+from src.models import TERMINAL_STATUSES, StatusUpdate
 
 logger = logging.getLogger(__name__)
 
@@ -26,12 +27,50 @@ class WebSocketManager:
     - Send window state commands (minimal/normal) to frontend
     - Handle connection lifecycle and cleanup
     - Support multiple concurrent connections per session
+    
+    Each connection owns a bounded outbound queue drained by its own relay
+    task, so producers never wait on a slow client's socket. Updates that
+    arrive within a short window are coalesced into a single JSON array
+    frame, keeping only the latest update for each subtask; a lone update
+    is still sent as a plain JSON object. The last few updates of each
+    session are kept as serialized messages and replayed to clients that
+    connect late.
     """
     
-    def __init__(self):
-        """Initialize the WebSocket manager with empty connection registry."""
+    def __init__(
+        self,
+        queue_size: int = 32,
+        batch_window: float = 0.02,
+        batch_max_items: int = 16,
+        replay_size: int = 8,
+        replay_sessions: int = 64
+    ):
+        """
+        Initialize the WebSocket manager with empty connection registry.
+        
+        Args:
+            queue_size: Maximum number of pending messages per connection;
+                the oldest message is dropped when a queue is full
+            batch_window: Seconds to wait for further updates before sending
+                a frame; terminal updates are sent immediately
+            batch_max_items: Maximum number of queued messages folded into
+                one frame
+            replay_size: Number of recent updates per session replayed to a
+                newly connected client
+            replay_sessions: Number of sessions whose recent updates are kept
+        """
         # Dictionary mapping session_id to list of active WebSocket connections
         self._connections: Dict[str, List[WebSocket]] = {}
+        # Per-connection outbound queues and the relay tasks draining them
+        self.queue_size = queue_size
+        self._queues: Dict[WebSocket, asyncio.Queue] = {}
+        self._relays: Dict[WebSocket, asyncio.Task] = {}
+        self.batch_window = batch_window
+        self.batch_max_items = batch_max_items
+        # Recent updates per session, least recently updated session first
+        self.replay_size = replay_size
+        self.replay_sessions = replay_sessions
+        self._recent: OrderedDict[str, Deque[Tuple[str, bool, Optional[str]]]] = OrderedDict()
         logger.info("WebSocketManager initialized")
     
     async def connect(self, websocket: WebSocket, session_id: str) -> None:
@@ -51,9 +90,18 @@ class WebSocketManager:
         # Add connection to the session's connection list
         self._connections[session_id].append(websocket)
         
+        # Start the relay that forwards queued messages to this client,
+        # primed with whatever the session broadcast before it connected
+        self._queues[websocket] = asyncio.Queue(maxsize=self.queue_size)
+        for encoded in self._recent.get(session_id, ()):
+            self._enqueue(websocket, session_id, *encoded)
+        self._relays[websocket] = asyncio.create_task(
+            self._relay(websocket, session_id)
+        )
+        
         logger.info(
-            f"WebSocket connected for session {session_id}. "
-            f"Total connections for session: {len(self._connections[session_id])}"
+            "WebSocket connected for session %s. Total connections for session: %s",
+            session_id, len(self._connections[session_id])
         )
     
     async def disconnect(self, websocket: WebSocket, session_id: str) -> None:
@@ -68,19 +116,21 @@ class WebSocketManager:
             if websocket in self._connections[session_id]:
                 self._connections[session_id].remove(websocket)
                 logger.info(
-                    f"WebSocket disconnected for session {session_id}. "
-                    f"Remaining connections: {len(self._connections[session_id])}"
+                    "WebSocket disconnected for session %s. Remaining connections: %s",
+                    session_id, len(self._connections[session_id])
                 )
             
             # Clean up empty connection lists
             if not self._connections[session_id]:
                 del self._connections[session_id]
-                logger.info(f"All connections closed for session {session_id}")
+                logger.info("All connections closed for session %s", session_id)
+        
+        self._stop_relay(websocket)
         
         try:
             await websocket.close()
         except Exception as e:
-            logger.warning(f"Error closing WebSocket: {e}")
+            logger.warning("Error closing WebSocket: %s", e)
     
     async def broadcast_update(
         self, 
@@ -94,45 +144,215 @@ class WebSocketManager:
             session_id: The execution session ID
             update: The StatusUpdate message to broadcast
         """
-        if session_id not in self._connections:
-            logger.warning(
-                f"No active connections for session {session_id}. "
-                f"Update not broadcast: {update.message}"
-            )
+        # Serialize once; the same message is replayed and sent to every client
+        encoded = self._encode(update)
+        self._remember(session_id, encoded)
+        
+        connections = self._connections.get(session_id)
+        if not connections:
+            logger.debug("No active connections for session %s; update kept for replay", session_id)
             return
         
-        # Convert update to JSON
-        update_json = update.model_dump_json()
+        for websocket in connections:
+            self._enqueue(websocket, session_id, *encoded)
+    
+    @staticmethod
+    def _encode(update: StatusUpdate) -> Tuple[str, bool, Optional[str]]:
+        """
+        Serialize a status update for the outbound queues.
+        
+        Null fields are omitted; the client treats a missing key as null.
+        An update carrying a window command gets no subtask ID, so a later
+        update for the same subtask cannot supersede it and lose the command.
+        
+        Args:
+            update: The StatusUpdate to serialize
+            
+        Returns:
+            JSON text, whether the update ends the session, and its subtask
+            ID when it may be superseded
+        """
+        return (
+            update.model_dump_json(exclude_none=True),
+            update.overall_status in TERMINAL_STATUSES,
+            update.subtask.id if update.subtask and update.window_state is None else None
+        )
+    
+    def _remember(self, session_id: str, encoded: Tuple[str, bool, Optional[str]]) -> None:
+        """
+        Keep a serialized update in the session's replay buffer.
+        
+        The JSON text is stored rather than the update, since the agent goes
+        on changing the subtask in place and a late client must see the state
+        as broadcast.
+        
+        Args:
+            session_id: The execution session ID
+            encoded: The update as returned by _encode
+        """
+        recent = self._recent.get(session_id)
+        if recent is None:
+            recent = self._recent[session_id] = deque(maxlen=self.replay_size)
+            if len(self._recent) > self.replay_sessions:
+                self._recent.popitem(last=False)
+        else:
+            self._recent.move_to_end(session_id)
+        recent.append(encoded)
+    
+    def _enqueue(
+        self,
+        websocket: WebSocket,
+        session_id: str,
+        message: str,
+        terminal: bool,
+        subtask_id: Optional[str]
+    ) -> None:
+        """
+        Add a serialized message to a connection's outbound queue.
+        
+        Args:
+            websocket: The destination WebSocket connection
+            session_id: The execution session ID
+            message: JSON text to send
+            terminal: Whether the message ends the session
+            subtask_id: Subtask the message describes, used to drop
+                superseded updates from a batch; None for other messages
+        """
+        queue = self._queues.get(websocket)
+        if queue is None:
+            return
+        if queue.full():
+            # Drop the oldest pending message to keep memory bounded
+            queue.get_nowait()
+            queue.task_done()
+            logger.warning(
+                "Outbound queue full for session %s; dropped oldest update", session_id
+            )
+        queue.put_nowait((message, terminal, subtask_id))
+    
+    async def flush(self, session_id: str) -> None:
+        """
+        Wait until every queued message for a session has been handled.
         
-        # Track disconnected clients for cleanup
-        disconnected = []
+        Args:
+            session_id: The execution session ID
+        """
+        queues = [
+            self._queues[websocket]
+            for websocket in self._connections.get(session_id, [])
+            if websocket in self._queues
+        ]
+        for queue in queues:
+            await queue.join()
+    
+    async def _relay(self, websocket: WebSocket, session_id: str) -> None:
+        """
+        Forward queued messages to a single client until it goes away.
         
-        # Broadcast to all connected clients
-        for websocket in self._connections[session_id]:
+        Args:
+            websocket: The WebSocket connection to write to
+            session_id: The execution session ID
+        """
+        queue = self._queues[websocket]
+        while True:
+            batch, taken = await self._next_batch(queue)
+            frame = batch[0] if len(batch) == 1 else f"[{','.join(batch)}]"
             try:
-                await websocket.send_text(update_json)
+                await websocket.send_text(frame)
                 logger.debug(
-                    f"Sent update to session {session_id}: {update.message}"
+                    "Sent %s update(s) to session %s", len(batch), session_id
                 )
             except WebSocketDisconnect:
                 logger.warning(
-                    f"Client disconnected during broadcast for session {session_id}"
+                    "Client disconnected during broadcast for session %s", session_id
                 )
-                disconnected.append(websocket)
+                break
             except Exception as e:
                 logger.error(
-                    f"Error sending update to session {session_id}: {e}"
+                    "Error sending update to session %s: %s", session_id, e
                 )
-                disconnected.append(websocket)
+                break
+            finally:
+                for _ in range(taken):
+                    queue.task_done()
         
-        # Clean up disconnected clients
-        for websocket in disconnected:
-            if websocket in self._connections[session_id]:
-                self._connections[session_id].remove(websocket)
+        # The client is gone; unregister it and release anything still queued
+        self._relays.pop(websocket, None)
+        connections = self._connections.get(session_id)
+        if connections is not None and websocket in connections:
+            connections.remove(websocket)
+            if not connections:
+                del self._connections[session_id]
+        self._drop_queue(websocket)
+    
+    async def _next_batch(self, queue: asyncio.Queue) -> Tuple[List[str], int]:
+        """
+        Wait for the next update and collect any that follow within the batch window.
+        
+        A later update for the same subtask replaces an earlier one in the
+        batch, since the client only keeps a subtask's latest state; updates
+        carrying a window command are always kept.
+        Collection stops early once a terminal update is taken so session
+        completion reaches the client without delay, or once
+        batch_max_items messages have been taken.
+        
+        Args:
+            queue: The connection's outbound queue
+            
+        Returns:
+            Serialized updates in arrival order, and the number of queue
+            items taken (including superseded ones)
+        """
+        update_json, terminal, subtask_id = await queue.get()
+        batch = [(subtask_id, update_json)]
+        taken = 1
         
-        # Clean up empty connection lists
-        if session_id in self._connections and not self._connections[session_id]:
-            del self._connections[session_id]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_window
+        try:
+            while not terminal and taken < self.batch_max_items:
+                if not queue.empty():
+                    update_json, terminal, subtask_id = queue.get_nowait()
+                    taken += 1
+                    if subtask_id is not None:
+                        batch = [item for item in batch if item[0] != subtask_id]
+                    batch.append((subtask_id, update_json))
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(remaining, 0.002))
+        except asyncio.CancelledError:
+            # Release messages already taken so flush() waiters are not stranded
+            for _ in range(taken):
+                queue.task_done()
+            raise
+        
+        return [message for _, message in batch], taken
+    
+    def _stop_relay(self, websocket: WebSocket) -> None:
+        """
+        Cancel a connection's relay task and drop its pending messages.
+        
+        Args:
+            websocket: The WebSocket connection whose relay should stop
+        """
+        relay = self._relays.pop(websocket, None)
+        if relay is not None:
+            relay.cancel()
+        self._drop_queue(websocket)
+    
+    def _drop_queue(self, websocket: WebSocket) -> None:
+        """
+        Remove a connection's outbound queue, marking pending messages done.
+        
+        Args:
+            websocket: The WebSocket connection whose queue should be dropped
+        """
+        queue = self._queues.pop(websocket, None)
+        while queue is not None and not queue.empty():
+            queue.get_nowait()
+            queue.task_done()
     
     async def send_window_state(
         self, 
@@ -149,49 +369,93 @@ class WebSocketManager:
             session_id: The execution session ID
             state: The window state to set ("minimal" or "normal")
         """
-        # Create a status update with window state command
-        update = StatusUpdate(
+        # Create a status update with window state command; every field is
+        # server-provided, so validation is skipped
+        update = StatusUpdate.model_construct(
             session_id=session_id,
             subtask=None,
             overall_status="in_progress",
             message=f"Window state: {state}",
             window_state=state,
-            timestamp=datetime.now()
+            timestamp=datetime.now(timezone.utc)
         )
         
         await self.broadcast_update(session_id, update)
         
         logger.info(
-            f"Sent window state command '{state}' for session {session_id}"
+            "Sent window state command '%s' for session %s", state, session_id
         )
     
-    async def close_all_connections(self, session_id: str) -> None:
+    async def close_all_connections(self, session_id: str, timeout: float = 2.0) -> None:
         """
         Close all WebSocket connections for a session.
         
         This is typically called when a session completes or is cancelled.
+        Connections are closed concurrently, and a socket that does not close
+        within the timeout is abandoned.
         
         Args:
             session_id: The execution session ID
+            timeout: Seconds to wait for each connection to close
         """
-        if session_id not in self._connections:
+        self._recent.pop(session_id, None)
+        connections = self._connections.pop(session_id, None)
+        if not connections:
+            return
+        
+        await self._close_sockets(connections, timeout)
+        logger.info("Closed all connections for session %s", session_id)
+    
+    async def close_all(self, timeout: float = 2.0) -> None:
+        """
+        Close every WebSocket connection across all sessions.
+        
+        Used on server shutdown. The registry is emptied in one step and all
+        sockets are closed concurrently.
+        
+        Args:
+            timeout: Seconds to wait for each connection to close
+        """
+        connections = [
+            websocket
+            for session_connections in self._connections.values()
+            for websocket in session_connections
+        ]
+        self._connections.clear()
+        self._recent.clear()
+        if not connections:
             return
         
-        connections = self._connections[session_id].copy()
+        await self._close_sockets(connections, timeout)
+        logger.info("Closed %s WebSocket connection(s)", len(connections))
+    
+    async def _close_sockets(self, connections: List[WebSocket], timeout: float) -> None:
+        """
+        Stop the relays for the given sockets and close them concurrently.
         
+        Args:
+            connections: Sockets already removed from the registry
+            timeout: Seconds to wait for each connection to close
+        """
         for websocket in connections:
-            try:
-                await websocket.close()
-            except Exception as e:
-                logger.warning(
-                    f"Error closing WebSocket for session {session_id}: {e}"
-                )
+            self._stop_relay(websocket)
         
-        # Clean up connection list
-        if session_id in self._connections:
-            del self._connections[session_id]
+        results = await asyncio.gather(
+            *(asyncio.wait_for(websocket.close(), timeout) for websocket in connections),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Error closing WebSocket: %r", result)
+    
+    def get_active_sessions(self) -> List[str]:
+        """
+        Get the IDs of all sessions with at least one open connection.
         
-        logger.info(f"Closed all connections for session {session_id}")
+        Returns:
+            Snapshot list of session IDs
+        """
+        return list(self._connections)
     
     def get_connection_count(self, session_id: str) -> int:
         """
@@ -0,0 +1,21 @@
+"""
+Shared fixtures for the AEGIS RPA Backend tests.
+"""
+
+from typing import Callable
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+
+@pytest.fixture
+def stream_response() -> Callable[..., MagicMock]:
+    """Return a factory for streamed Gemini responses that yield text in small chunks."""
+    def build(text: str, chunk_size: int = 16) -> MagicMock:
+        response = MagicMock()
+        response.__aiter__.return_value = [
+            Mock(text=text[i:i + chunk_size]) for i in range(0, len(text), chunk_size)
+        ]
+        return response
+    
+    return build
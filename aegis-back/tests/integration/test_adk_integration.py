@@ -6,7 +6,7 @@ and instruction execution with real tool functions.
 """
 
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from src.adk_agent import ADKAgentManager
 from src.models import ToolResult
 
@@ -14,7 +14,7 @@ from src.models import ToolResult
 @pytest.mark.asyncio
 @patch('google.generativeai.configure')
 @patch('google.generativeai.GenerativeModel')
-async def test_full_execution_flow_with_tool_calls(mock_model_class, mock_configure):
+async def test_full_execution_flow_with_tool_calls(mock_model_class, mock_configure, stream_response):
     """Test complete execution flow with tool calls."""
     # Setup manager
     manager = ADKAgentManager(api_key="test_key")
@@ -36,7 +36,7 @@ async def test_full_execution_flow_with_tool_calls(mock_model_class, mock_config
     {"tool": "mock_click", "args": {"x": 300, "y": 400, "button": "right"}}
     '''
     
-    mock_model.generate_content.return_value = mock_response
+    mock_model.generate_content_async = AsyncMock(return_value=stream_response(mock_response.text))
     mock_model_class.return_value = mock_model
     
     # Initialize agent
@@ -64,7 +64,7 @@ async def test_full_execution_flow_with_tool_calls(mock_model_class, mock_config
 @pytest.mark.asyncio
 @patch('google.generativeai.configure')
 @patch('google.generativeai.GenerativeModel')
-async def test_execution_with_tool_failure(mock_model_class, mock_configure):
+async def test_execution_with_tool_failure(mock_model_class, mock_configure, stream_response):
     """Test execution flow when a tool fails."""
     # Setup manager
     manager = ADKAgentManager(api_key="test_key")
@@ -82,7 +82,7 @@ async def test_execution_with_tool_failure(mock_model_class, mock_configure):
     mock_response = Mock()
     mock_response.text = '{"tool": "failing_tool", "args": {"param": "test"}}'
     
-    mock_model.generate_content.return_value = mock_response
+    mock_model.generate_content_async = AsyncMock(return_value=stream_response(mock_response.text))
     mock_model_class.return_value = mock_model
     
     # Initialize agent
@@ -113,7 +113,7 @@ async def test_execution_with_tool_failure(mock_model_class, mock_configure):
 @pytest.mark.asyncio
 @patch('google.generativeai.configure')
 @patch('google.generativeai.GenerativeModel')
-async def test_execution_with_no_tool_calls(mock_model_class, mock_configure):
+async def test_execution_with_no_tool_calls(mock_model_class, mock_configure, stream_response):
     """Test execution when no tool calls are needed."""
     # Setup manager
     manager = ADKAgentManager(api_key="test_key")
@@ -123,7 +123,7 @@ async def test_execution_with_no_tool_calls(mock_model_class, mock_configure):
     mock_response = Mock()
     mock_response.text = "This task doesn't require any tools."
     
-    mock_model.generate_content.return_value = mock_response
+    mock_model.generate_content_async = AsyncMock(return_value=stream_response(mock_response.text))
     mock_model_class.return_value = mock_model
     
     # Initialize agent
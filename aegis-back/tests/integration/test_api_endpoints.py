@@ -4,13 +4,24 @@ Integration tests for FastAPI endpoints.
 Tests the REST API endpoints and WebSocket functionality.
 """
 
+import asyncio
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, patch, AsyncMock
 from datetime import datetime
 
-from main import app
+from main import (
+    app,
+    get_preprocessor,
+    get_session_manager,
+    get_history_store,
+    get_websocket_manager,
+    is_replayable_plan,
+    pending_saves,
+    save_session_in_background
+)
 from src.models import (
+    ExecutionPlan,
     TaskInstructionRequest,
     ExecutionSession,
     SessionSummary,
@@ -27,58 +38,70 @@ def client():
 @pytest.fixture
 def mock_services():
     """Mock all service dependencies."""
-    with patch('main.preprocessor') as mock_preprocessor, \
-         patch('main.session_manager') as mock_session_manager, \
-         patch('main.history_store') as mock_history_store, \
-         patch('main.websocket_manager') as mock_websocket_manager:
-        
-        # Configure mocks
-        mock_preprocessor.validate_and_sanitize.return_value = (
-            Mock(is_valid=True),
-            "Open notepad"
-        )
-        
-        mock_session_manager.create_session.return_value = "test-session-123"
-        mock_session_manager.get_session.return_value = ExecutionSession(
-            session_id="test-session-123",
-            instruction="Open notepad",
-            status="pending",
-            subtasks=[],
-            created_at=datetime.now(),
-            updated_at=datetime.now()
-        )
-        mock_session_manager.cancel_session.return_value = True
-        
-        mock_history_store.get_all_sessions.return_value = [
-            SessionSummary(
-                session_id="test-session-123",
-                instruction="Open notepad",
-                status="completed",
-                created_at=datetime.now(),
-                completed_at=datetime.now(),
-                subtask_count=2
-            )
-        ]
-        mock_history_store.get_session_details.return_value = ExecutionSession(
+    mock_preprocessor = Mock()
+    mock_session_manager = Mock()
+    mock_history_store = Mock()
+    mock_websocket_manager = Mock()
+    
+    # Configure mocks
+    mock_preprocessor.validate_and_sanitize.return_value = (
+        Mock(is_valid=True),
+        "Open notepad"
+    )
+    
+    mock_session_manager.create_session.return_value = "test-session-123"
+    mock_session_manager.get_session.return_value = ExecutionSession(
+        session_id="test-session-123",
+        instruction="Open notepad",
+        status="pending",
+        subtasks=[],
+        created_at=datetime.now(),
+        updated_at=datetime.now()
+    )
+    mock_session_manager.cancel_session.return_value = True
+    
+    mock_history_store.version = 1
+    mock_history_store.get_cached_session_details.return_value = None
+    mock_history_store.get_all_sessions.return_value = [
+        SessionSummary(
             session_id="test-session-123",
             instruction="Open notepad",
             status="completed",
-            subtasks=[],
             created_at=datetime.now(),
-            updated_at=datetime.now(),
-            completed_at=datetime.now()
+            completed_at=datetime.now(),
+            subtask_count=2
         )
-        
-        # Make websocket_manager methods async
-        mock_websocket_manager.send_window_state = AsyncMock()
-        mock_websocket_manager.broadcast_update = AsyncMock()
-        
-        yield {
-            'preprocessor': mock_preprocessor,
-            'session_manager': mock_session_manager,
-            'history_store': mock_history_store,
-            'websocket_manager': mock_websocket_manager
-        }
+    ]
+    mock_history_store.get_session_details.return_value = ExecutionSession(
+        session_id="test-session-123",
+        instruction="Open notepad",
+        status="completed",
+        subtasks=[],
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+        completed_at=datetime.now()
+    )
+    
+    # Make websocket_manager methods async
+    mock_websocket_manager.send_window_state = AsyncMock()
+    mock_websocket_manager.broadcast_update = AsyncMock()
+    
+    # Inject the mocks in place of the real service providers
+    app.dependency_overrides.update({
+        get_preprocessor: lambda: mock_preprocessor,
+        get_session_manager: lambda: mock_session_manager,
+        get_history_store: lambda: mock_history_store,
+        get_websocket_manager: lambda: mock_websocket_manager
+    })
+    
+    yield {
+        'preprocessor': mock_preprocessor,
+        'session_manager': mock_session_manager,
+        'history_store': mock_history_store,
+        'websocket_manager': mock_websocket_manager
+    }
+    
+    app.dependency_overrides.clear()
 
 
 def test_root_endpoint(client):
@@ -104,6 +127,21 @@ def test_start_task_success(client, mock_services):
     assert data["message"] == "Task queued for execution"
 
 
+def test_start_task_reports_queue_position(client, mock_services):
+    """Test that the response tells the client where its task is queued."""
+    queue = asyncio.Queue(maxsize=5)
+    queue.put_nowait("queued-session")
+    
+    with patch('main.request_queue', queue):
+        response = client.post(
+            "/api/start_task",
+            json={"instruction": "Open notepad"}
+        )
+    
+    assert response.status_code == 200
+    assert response.json()["queue_position"] == 2
+
+
 def test_start_task_validation_failure(client, mock_services):
     """Test task submission with invalid instruction."""
     # Configure mock to return validation failure
@@ -120,6 +158,23 @@ def test_start_task_validation_failure(client, mock_services):
     assert response.status_code == 422
 
 
+def test_start_task_queue_full(client, mock_services):
+    """Test task submission is rejected with 429 when the queue is full."""
+    full_queue = asyncio.Queue(maxsize=1)
+    full_queue.put_nowait("queued-session")
+    
+    with patch('main.request_queue', full_queue):
+        response = client.post(
+            "/api/start_task",
+            json={"instruction": "Open notepad"}
+        )
+    
+    assert response.status_code == 429
+    assert response.json()["error"] == "QueueFullError"
+    assert response.headers["retry-after"] == "5"
+    mock_services['session_manager'].create_session.assert_not_called()
+
+
 def test_get_history(client, mock_services):
     """Test retrieving execution history."""
     response = client.get("/api/history")
@@ -141,6 +196,80 @@ def test_get_history_with_limit(client, mock_services):
     assert "total" in data
 
 
+def test_get_history_rejects_out_of_range_limit(client, mock_services):
+    """Test that history limits outside 1..MAX_HISTORY_LIMIT are rejected."""
+    assert client.get("/api/history?limit=0").status_code == 422
+    assert client.get("/api/history?limit=100000").status_code == 422
+    mock_services['history_store'].get_all_sessions.assert_not_called()
+
+
+def test_get_history_returns_etag(client, mock_services):
+    """Test that history responses carry an ETag."""
+    response = client.get("/api/history")
+    
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"')
+
+
+def test_get_history_sets_cache_control(client, mock_services):
+    """Test that history responses allow brief client-side caching."""
+    response = client.get("/api/history")
+    
+    assert response.headers["cache-control"] == "private, max-age=1"
+
+
+def test_get_history_not_modified_when_etag_matches(client, mock_services):
+    """Test that a matching If-None-Match yields 304 without reading history."""
+    etag = client.get("/api/history").headers["etag"]
+    mock_services['history_store'].get_all_sessions.reset_mock()
+    
+    response = client.get("/api/history", headers={"If-None-Match": etag})
+    
+    assert response.status_code == 304
+    assert response.content == b""
+    mock_services['history_store'].get_all_sessions.assert_not_called()
+
+
+def test_get_history_etag_changes_after_save(client, mock_services):
+    """Test that the ETag changes once history has been modified."""
+    etag = client.get("/api/history").headers["etag"]
+    mock_services['history_store'].version = 2
+    
+    response = client.get("/api/history", headers={"If-None-Match": etag})
+    
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_get_history_compresses_large_payload(client, mock_services):
+    """Test that large history responses are gzip-compressed."""
+    mock_services['history_store'].get_all_sessions.return_value = [
+        SessionSummary(
+            session_id=f"session-{i}",
+            instruction="Open notepad and type a long message",
+            status="completed",
+            created_at=datetime.now(),
+            completed_at=datetime.now(),
+            subtask_count=2
+        )
+        for i in range(50)
+    ]
+    
+    response = client.get("/api/history", headers={"Accept-Encoding": "gzip"})
+    
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()["sessions"]) == 50
+
+
+def test_cors_does_not_allow_credentials(client, mock_services):
+    """Test that cross-origin responses are not credentialed."""
+    response = client.get("/", headers={"Origin": "http://localhost:3000"})
+    
+    assert response.headers["access-control-allow-origin"] == "*"
+    assert "access-control-allow-credentials" not in response.headers
+
+
 def test_get_session_details_success(client, mock_services):
     """Test retrieving session details for existing session."""
     response = client.get("/api/history/test-session-123")
@@ -162,6 +291,63 @@ def test_get_session_details_not_found(client, mock_services):
     assert response.status_code == 404
 
 
+def test_get_session_details_uses_cached_history(client, mock_services):
+    """Test that a session cached by the history store skips the disk read."""
+    mock_services['session_manager'].get_session.return_value = None
+    mock_services['history_store'].get_cached_session_details.return_value = (
+        mock_services['history_store'].get_session_details.return_value
+    )
+    
+    response = client.get("/api/history/test-session-123")
+    
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    mock_services['history_store'].get_session_details.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_save_session_in_background_is_tracked_until_done():
+    """Test that background history saves are tracked and then released."""
+    history_store = Mock()
+    history_store.save_session.side_effect = [OSError("disk full"), None]
+    sessions = [
+        ExecutionSession(
+            session_id=f"session-{i}",
+            instruction="Open notepad",
+            status="completed",
+            subtasks=[],
+            created_at=datetime.now(),
+            updated_at=datetime.now()
+        )
+        for i in range(2)
+    ]
+    
+    for session in sessions:
+        save_session_in_background(history_store, session)
+    assert len(pending_saves) == 2
+    
+    # A failed write is logged, not raised
+    await asyncio.gather(*pending_saves)
+    await asyncio.sleep(0)
+    
+    assert history_store.save_session.call_count == 2
+    assert not pending_saves
+
+
+def test_only_exact_instruction_replays_cached_plan():
+    """Test that similar but different instructions are re-planned, not replayed."""
+    plan = ExecutionPlan(
+        instruction="Open notepad and type the revenue report for 2023",
+        subtasks=[{"tool_name": "type_text", "tool_args": {"text": "2023"}, "description": "type"}],
+        created_at=datetime.now()
+    )
+    
+    assert is_replayable_plan(plan, "Open notepad and type the revenue report for 2023")
+    assert not is_replayable_plan(plan, "Open notepad and type the revenue report for 2024")
+    assert not is_replayable_plan(plan, "open notepad and type the revenue report for 2023")
+    assert not is_replayable_plan(None, "Open notepad")
+
+
 def test_cancel_execution_success(client, mock_services):
     """Test cancelling an ongoing execution."""
     response = client.delete("/api/execution/test-session-123")
@@ -0,0 +1,291 @@
+"""
+Unit tests for Action Observer.
+
+Tests screen state encoding and before/after action verification.
+"""
+
+import base64
+import threading
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image
+
+from src.action_observer import ActionObserver, ScreenState, _pixel_similarity, _similarity_below
+
+
+def make_state(color=(255, 255, 255), size=(40, 30)) -> ScreenState:
+    """Build a screen state from a solid-color image."""
+    return ScreenState(Image.new("RGB", size, color), timestamp=0.0)
+
+
+class TestScreenState:
+    """Test suite for ScreenState."""
+
+    def test_base64_data_is_encoded_lazily(self):
+        """Test that the PNG is only encoded when base64_data is read, and once."""
+        with patch.object(ScreenState, "_encode_image", return_value="encoded") as encode:
+            state = make_state()
+            encode.assert_not_called()
+
+            assert state.base64_data == "encoded"
+            assert state.base64_data == "encoded"
+            encode.assert_called_once()
+
+    def test_base64_data_round_trips_to_png(self):
+        """Test that base64_data decodes to the captured image."""
+        state = make_state(color=(10, 20, 30))
+
+        decoded = Image.open(BytesIO(base64.b64decode(state.base64_data)))
+
+        assert decoded.format == "PNG"
+        assert decoded.size == (40, 30)
+        assert decoded.getpixel((0, 0)) == (10, 20, 30)
+
+    def test_encoded_region_encodes_only_the_crop(self):
+        """Test that encoded_region encodes the region without the full screen."""
+        state = make_state(color=(10, 20, 30))
+
+        decoded = Image.open(BytesIO(base64.b64decode(state.encoded_region((5, 5, 10, 8)))))
+
+        assert decoded.size == (10, 8)
+        assert decoded.getpixel((0, 0)) == (10, 20, 30)
+        assert "base64_data" not in vars(state)
+
+
+class TestCaptureState:
+    """Test suite for screen capture."""
+
+    def test_capture_state_uses_mss_when_available(self):
+        """Test that mss captures the region and its handle is reused."""
+        observer = ActionObserver()
+        shot = MagicMock(size=(2, 1), bgra=bytes([30, 20, 10, 255, 60, 50, 40, 255]))
+        fake_mss = MagicMock()
+        fake_mss.mss.return_value.grab.return_value = shot
+
+        with patch("src.action_observer.MSS_AVAILABLE", True), \
+                patch("src.action_observer.mss", fake_mss, create=True):
+            state = observer.capture_state(region=(5, 6, 2, 1))
+            observer.capture_state(region=(5, 6, 2, 1))
+
+        fake_mss.mss.assert_called_once()
+        fake_mss.mss.return_value.grab.assert_called_with(
+            {"left": 5, "top": 6, "width": 2, "height": 1}
+        )
+        assert state.image.mode == "RGB"
+        assert state.image.getpixel((0, 0)) == (10, 20, 30)
+        assert state.image.getpixel((1, 0)) == (40, 50, 60)
+
+    @pytest.mark.asyncio
+    async def test_capture_state_async_uses_worker_thread(self):
+        """Test that the async capture runs capture_state off the event loop."""
+        observer = ActionObserver()
+        capture_threads = []
+
+        def capture(region=None):
+            capture_threads.append(threading.current_thread())
+            return make_state()
+
+        with patch.object(observer, "capture_state", side_effect=capture) as capture_state:
+            state = await observer.capture_state_async(region=(0, 0, 10, 10))
+
+        capture_state.assert_called_once_with((0, 0, 10, 10))
+        assert state.image.size == (40, 30)
+        assert capture_threads[0] is not threading.main_thread()
+
+
+class TestImageComparison:
+    """Test suite for before/after image comparison."""
+
+    def half_changed(self) -> Image.Image:
+        """Build a white image whose left half is black."""
+        image = Image.new("RGB", (40, 30), (255, 255, 255))
+        image.paste((0, 0, 0), (0, 0, 20, 30))
+        return image
+
+    def test_similarity_of_identical_images(self):
+        """Test that identical images are fully similar."""
+        observer = ActionObserver()
+        image = Image.new("RGB", (40, 30), (1, 2, 3))
+
+        assert observer.calculate_image_similarity(image, image.copy()) == 1.0
+
+    def test_similarity_counts_changed_pixels(self):
+        """Test that similarity is the fraction of unchanged pixels."""
+        observer = ActionObserver()
+        before = Image.new("RGB", (40, 30), (255, 255, 255))
+
+        assert observer.calculate_image_similarity(before, self.half_changed()) == 0.5
+
+    def test_similarity_without_numpy(self):
+        """Test that the PIL fallback gives the same score."""
+        observer = ActionObserver()
+        before = Image.new("RGB", (40, 30), (255, 255, 255))
+
+        with patch("src.action_observer.NUMPY_AVAILABLE", False):
+            assert observer.calculate_image_similarity(before, self.half_changed()) == 0.5
+
+    def test_slight_change_scores_the_same_without_numpy(self):
+        """Test that both comparison paths count a one-level change as changed."""
+        before = Image.new("RGB", (40, 30), (100, 100, 100))
+        after = before.copy()
+        after.paste((101, 100, 100), (0, 0, 20, 30))
+
+        scores = []
+        checks = []
+        for numpy_available in (True, False):
+            with patch("src.action_observer.NUMPY_AVAILABLE", numpy_available):
+                scores.append(_pixel_similarity(before, after))
+                checks.append(_similarity_below(before, after, 0.95))
+
+        assert scores == [0.5, 0.5]
+        assert checks == [True, True]
+
+    def test_verify_action_detects_change(self):
+        """Test that a click is verified when the screen changed."""
+        observer = ActionObserver()
+        before = make_state()
+        after = ScreenState(self.half_changed(), timestamp=1.0)
+
+        assert observer.verify_action(before, after, "click") is True
+        assert observer.verify_action(before, after, "no_change") is False
+
+    def test_verify_action_detects_no_change(self):
+        """Test that an unchanged screen fails a click and passes no_change."""
+        observer = ActionObserver()
+        before = make_state()
+        after = make_state()
+
+        assert observer.verify_action(before, after, "click") is False
+        assert observer.verify_action(before, after, "no_change") is True
+
+    def test_identical_images_skip_pixel_comparison(self):
+        """Test that byte-identical images are scored without a diff pass."""
+        observer = ActionObserver()
+        image = Image.new("RGB", (40, 30), (1, 2, 3))
+
+        with patch("src.action_observer.ImageChops.difference") as difference, \
+                patch("src.action_observer.NUMPY_AVAILABLE", False):
+            assert observer.calculate_image_similarity(image, image.copy()) == 1.0
+
+        difference.assert_not_called()
+
+    def test_similarity_compares_overlap_of_mismatched_sizes(self):
+        """Test that differently sized images are cropped, not resampled."""
+        observer = ActionObserver()
+        before = Image.new("RGB", (40, 30), (255, 255, 255))
+        after = Image.new("RGB", (20, 30), (255, 255, 255))
+
+        with patch.object(Image.Image, "resize") as resize:
+            assert observer.calculate_image_similarity(before, after) == 1.0
+            assert observer.verify_action(make_state(), ScreenState(after, timestamp=1.0), "no_change") is True
+
+        resize.assert_not_called()
+
+    def test_threshold_check_matches_full_similarity(self):
+        """Test that the early-exit threshold check agrees with the full score."""
+        before = Image.new("RGB", (40, 30), (255, 255, 255))
+        after = self.half_changed()
+
+        with patch("src.action_observer._COMPARE_TILE_PIXELS", 64):
+            for threshold in (0.25, 0.4999, 0.5, 0.5001, 0.75):
+                expected = _pixel_similarity(before, after) < threshold
+                assert _similarity_below(before, after, threshold) is expected
+
+
+class TestErrorDialogDetection:
+    """Test suite for OCR-based error detection."""
+
+    def test_detect_error_dialogs_reads_keyword(self):
+        """Test that an error keyword in the OCR text is reported."""
+        observer = ActionObserver()
+        fake_tesseract = MagicMock()
+        fake_tesseract.image_to_string.return_value = "Setup\nError: file not found\nRetry"
+
+        with patch("src.action_observer.OCR_AVAILABLE", True), \
+                patch("src.action_observer.pytesseract", fake_tesseract, create=True):
+            error = observer.detect_error_dialogs(make_state())
+
+        assert error.error_type == "dialog"
+        assert error.message == "Error: file not found Retry"
+
+    def test_ocr_is_reused_for_unchanged_screen(self):
+        """Test that an identical screenshot is not OCR'd twice."""
+        observer = ActionObserver()
+        fake_tesseract = MagicMock()
+        fake_tesseract.image_to_string.return_value = "All good"
+
+        with patch("src.action_observer.OCR_AVAILABLE", True), \
+                patch("src.action_observer.pytesseract", fake_tesseract, create=True):
+            assert observer.detect_error_dialogs(make_state()) is None
+            assert observer.detect_error_dialogs(make_state()) is None
+            observer.detect_error_dialogs(make_state(color=(0, 0, 0)))
+
+        assert fake_tesseract.image_to_string.call_count == 2
+
+    def test_tesserocr_api_is_reused(self):
+        """Test that the in-process Tesseract API is created once and released on close."""
+        observer = ActionObserver()
+        fake_tesserocr = MagicMock()
+        api = fake_tesserocr.PyTessBaseAPI.return_value
+        api.GetUTF8Text.return_value = "Access denied"
+
+        with patch("src.action_observer.OCR_AVAILABLE", True), \
+                patch("src.action_observer.TESSEROCR_AVAILABLE", True), \
+                patch("src.action_observer.tesserocr", fake_tesserocr, create=True):
+            assert observer.detect_error_dialogs(make_state()).message == "Access denied"
+            observer.detect_error_dialogs(make_state(color=(0, 0, 0)))
+            observer.close()
+
+        fake_tesserocr.PyTessBaseAPI.assert_called_once()
+        assert api.SetImage.call_count == 2
+        api.End.assert_called_once()
+
+    def test_ocr_input_is_grayscale_and_bounded(self):
+        """Test that OCR receives a grayscale image no larger than the limit."""
+        observer = ActionObserver()
+        fake_tesseract = MagicMock()
+        fake_tesseract.image_to_string.return_value = ""
+        state = ScreenState(Image.new("RGB", (3840, 2160), (200, 200, 200)), timestamp=0.0)
+
+        with patch("src.action_observer.OCR_AVAILABLE", True), \
+                patch("src.action_observer.pytesseract", fake_tesseract, create=True):
+            observer.detect_error_dialogs(state)
+
+        ocr_image = fake_tesseract.image_to_string.call_args[0][0]
+        assert ocr_image.mode == "L"
+        assert ocr_image.size == (1920, 1080)
+        # The screenshot itself is left untouched
+        assert state.image.size == (3840, 2160)
+
+    def test_error_message_starts_at_first_keyword_line(self):
+        """Test that the reported message is the first matching line and the two after it."""
+        observer = ActionObserver()
+        fake_tesseract = MagicMock()
+        fake_tesseract.image_to_string.return_value = (
+            "Installer\nThe file COULD NOT be opened\nCheck the path\nOK\nCancel"
+        )
+
+        with patch("src.action_observer.OCR_AVAILABLE", True), \
+                patch("src.action_observer.pytesseract", fake_tesseract, create=True):
+            error = observer.detect_error_dialogs(make_state())
+
+        assert error.message == "The file COULD NOT be opened Check the path OK"
+
+    @pytest.mark.asyncio
+    async def test_detect_error_dialogs_async_runs_off_the_loop(self):
+        """Test that the async variant runs OCR in a worker thread."""
+        observer = ActionObserver()
+        ocr_threads = []
+        fake_tesseract = MagicMock()
+        fake_tesseract.image_to_string.side_effect = (
+            lambda image: ocr_threads.append(threading.current_thread()) or "Operation failed"
+        )
+
+        with patch("src.action_observer.OCR_AVAILABLE", True), \
+                patch("src.action_observer.pytesseract", fake_tesseract, create=True):
+            error = await observer.detect_error_dialogs_async(make_state())
+
+        assert error.message == "Operation failed"
+        assert ocr_threads[0] is not threading.main_thread()
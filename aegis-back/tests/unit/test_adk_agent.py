@@ -5,10 +5,12 @@ Tests the initialization, tool registration, and basic functionality
 of the ADK Agent Manager component.
 """
 
+import asyncio
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from src.adk_agent import ADKAgentManager
-from src.models import ToolResult
+from src.models import ExecutionPlan, SubtaskStatus, ToolResult
 
 
 class TestADKAgentManager:
@@ -100,6 +102,19 @@ class TestADKAgentManager:
         assert manager.tool_map["mock_tool_1"] == mock_tool_1
         assert manager.tool_map["mock_tool_2"] == mock_tool_2
     
+    @pytest.mark.asyncio
+    @patch('google.generativeai.configure')
+    @patch('google.generativeai.GenerativeModel')
+    async def test_ensure_initialized_runs_once(self, mock_model_class, mock_configure):
+        """Test that concurrent first uses initialize the agent once."""
+        manager = ADKAgentManager(api_key="test_key")
+        
+        await asyncio.gather(*(manager.ensure_initialized() for _ in range(3)))
+        await manager.ensure_initialized()
+        
+        assert manager.model is not None
+        mock_model_class.assert_called_once()
+    
     @pytest.mark.asyncio
     async def test_execute_instruction_without_initialization(self):
         """Test that execution fails if agent not initialized."""
@@ -112,7 +127,7 @@ class TestADKAgentManager:
     @pytest.mark.asyncio
     @patch('google.generativeai.configure')
     @patch('google.generativeai.GenerativeModel')
-    async def test_execute_instruction_basic_flow(self, mock_model_class, mock_configure):
+    async def test_execute_instruction_basic_flow(self, mock_model_class, mock_configure, stream_response):
         """Test basic instruction execution flow."""
         manager = ADKAgentManager(api_key="test_key")
         
@@ -123,7 +138,7 @@ class TestADKAgentManager:
         # Mock response with text (no tool calls)
         mock_response.text = "Task completed successfully"
         
-        mock_model.generate_content.return_value = mock_response
+        mock_model.generate_content_async = AsyncMock(return_value=stream_response(mock_response.text))
         mock_model_class.return_value = mock_model
         
         manager.initialize_agent()
@@ -138,6 +153,173 @@ class TestADKAgentManager:
         assert updates[-1].overall_status == "completed"
         assert updates[-1].session_id == "session_1"
     
+    @pytest.mark.asyncio
+    @patch('google.generativeai.configure')
+    @patch('google.generativeai.GenerativeModel')
+    async def test_concurrent_executions_do_not_interleave_tools(self, mock_model_class, mock_configure, stream_response):
+        """Test that the desktop lock serializes tool runs across sessions."""
+        manager = ADKAgentManager(api_key="test_key")
+        
+        calls = []
+        
+        def record_step(step: str) -> ToolResult:
+            """Record step"""
+            calls.append(step)
+            return ToolResult(success=True, data={"step": step})
+        
+        manager.register_toolbox([record_step])
+        
+        mock_model = Mock()
+        mock_response = Mock()
+        mock_response.text = (
+            '{"tool": "record_step", "args": {"step": "first"}}\n'
+            '{"tool": "record_step", "args": {"step": "second"}}'
+        )
+        mock_model.generate_content_async = AsyncMock(return_value=stream_response(mock_response.text))
+        mock_model_class.return_value = mock_model
+        
+        manager.initialize_agent()
+        
+        async def run(session_id: str):
+            async for update in manager.execute_instruction("task", session_id):
+                if update.subtask and update.subtask.status == SubtaskStatus.IN_PROGRESS:
+                    calls.append(session_id)
+                # Give the other session a chance to run between steps
+                await asyncio.sleep(0)
+        
+        await asyncio.gather(run("session_a"), run("session_b"))
+        
+        # Each session's steps run back to back
+        first = calls[0]
+        assert calls[:4] == [first, "first", first, "second"]
+        assert first not in calls[4:]
+    
+    @pytest.mark.asyncio
+    @patch('google.generativeai.configure')
+    @patch('google.generativeai.GenerativeModel')
+    async def test_execute_plan_replays_cached_steps(self, mock_model_class, mock_configure):
+        """Test that a cached plan runs its tools without calling the model."""
+        manager = ADKAgentManager(api_key="test_key")
+        
+        calls = []
+        
+        def record_step(step: str) -> ToolResult:
+            """Record step"""
+            calls.append(step)
+            return ToolResult(success=True, data={"step": step})
+        
+        manager.register_toolbox([record_step])
+        
+        mock_model = Mock()
+        mock_model_class.return_value = mock_model
+        manager.initialize_agent()
+        
+        plan = ExecutionPlan(
+            instruction="task",
+            subtasks=[
+                {"tool_name": "record_step", "tool_args": {"step": "first"}, "description": "first"},
+                {"tool_name": "record_step", "tool_args": {"step": "second"}, "description": "second"}
+            ],
+            created_at=datetime.now()
+        )
+        
+        updates = []
+        async for update in manager.execute_plan(plan, "session_1"):
+            updates.append(update)
+        
+        assert calls == ["first", "second"]
+        assert updates[-1].overall_status == "completed"
+        mock_model.generate_content_async.assert_not_called()
+    
+    @pytest.mark.asyncio
+    @patch('google.generativeai.configure')
+    @patch('google.generativeai.GenerativeModel')
+    async def test_execute_instruction_starts_before_response_completes(self, mock_model_class, mock_configure):
+        """Test that the first tool runs while the rest of the plan is still streaming."""
+        manager = ADKAgentManager(api_key="test_key")
+        
+        calls = []
+        seen_before_rest = []
+        locked_before_first_call = []
+        
+        def record_step(step: str) -> ToolResult:
+            """Record step"""
+            calls.append(step)
+            return ToolResult(success=True, data={"step": step})
+        
+        manager.register_toolbox([record_step])
+        
+        async def chunks():
+            locked_before_first_call.append(manager._desktop_lock.locked())
+            yield Mock(text='{"tool": "record_step", "args": {"step": "first"}}\n{"tool": "rec')
+            seen_before_rest.extend(calls)
+            yield Mock(text='ord_step", "args": {"step": "second"}}')
+        
+        mock_model = Mock()
+        mock_model.generate_content_async = AsyncMock(return_value=chunks())
+        mock_model_class.return_value = mock_model
+        
+        manager.initialize_agent()
+        
+        updates = []
+        async for update in manager.execute_instruction("task", "session_1"):
+            updates.append(update)
+        
+        assert locked_before_first_call == [False]
+        assert seen_before_rest == ["first"]
+        assert calls == ["first", "second"]
+        assert updates[-1].overall_status == "completed"
+        mock_model.generate_content_async.assert_awaited_once()
+        assert mock_model.generate_content_async.call_args.kwargs == {"stream": True}
+    
+    @pytest.mark.asyncio
+    @patch('src.adk_agent.asyncio.sleep', new_callable=AsyncMock)
+    @patch('google.generativeai.configure')
+    @patch('google.generativeai.GenerativeModel')
+    async def test_execute_instruction_retries_gemini_call_once(
+        self, mock_model_class, mock_configure, mock_sleep, stream_response
+    ):
+        """Test that a transient Gemini error retries the call, not the planning work."""
+        manager = ADKAgentManager(api_key="test_key")
+        
+        mock_model = Mock()
+        mock_model.generate_content_async = AsyncMock(side_effect=[
+            TimeoutError("request timeout"),
+            stream_response("Nothing to do"),
+        ])
+        mock_model_class.return_value = mock_model
+        
+        manager.initialize_agent()
+        
+        with patch.object(manager, "_build_system_prompt", wraps=manager._build_system_prompt) as build:
+            updates = [update async for update in manager.execute_instruction("task", "session_1")]
+        
+        build.assert_called_once()
+        mock_sleep.assert_awaited_once_with(2)
+        assert mock_model.generate_content_async.await_count == 2
+        assert updates[-1].overall_status == "completed"
+    
+    @pytest.mark.asyncio
+    @patch('src.adk_agent.asyncio.sleep', new_callable=AsyncMock)
+    @patch('google.generativeai.configure')
+    @patch('google.generativeai.GenerativeModel')
+    async def test_execute_instruction_fails_after_retries(self, mock_model_class, mock_configure, mock_sleep):
+        """Test that repeated connection errors end in a single failure update."""
+        manager = ADKAgentManager(api_key="test_key")
+        
+        mock_model = Mock()
+        mock_model.generate_content_async = AsyncMock(side_effect=ConnectionError("connection reset"))
+        mock_model_class.return_value = mock_model
+        
+        manager.initialize_agent()
+        
+        updates = [update async for update in manager.execute_instruction("task", "session_1")]
+        
+        assert mock_model.generate_content_async.await_count == 2
+        assert len(updates) == 1
+        assert updates[0].overall_status == "failed"
+        assert "connection reset" in updates[0].message
+    
     def test_tool_map_stores_functions_correctly(self):
         """Test that tool map correctly stores function references."""
         manager = ADKAgentManager(api_key="test_key")
@@ -152,3 +334,61 @@ class TestADKAgentManager:
         result = manager.tool_map["test_func"](param="test")
         assert result.success is True
         assert result.data["param"] == "test"
+    
+    @pytest.mark.asyncio
+    async def test_stream_tool_calls_from_lines_and_code_blocks(self, stream_response):
+        """Test that tool calls are parsed from JSON lines, embedded JSON and code blocks."""
+        manager = ADKAgentManager(api_key="test_key")
+        
+        response_text = (
+            '{"tool": "open_application", "args": {"app_name": "notepad"}}\n'
+            '{"tool": "type_text", "args": {"text": "hi"}} then done\n'
+            'no tool here\n'
+            '```json\n{"tool": "press_key", "args": {"key": "enter"}}\n```'
+        )
+        
+        tool_calls = [call async for call in manager._stream_tool_calls(stream_response(response_text, 7))]
+        
+        assert [call["tool"] for call in tool_calls] == ["open_application", "type_text", "press_key"]
+    
+    def test_tool_descriptions_are_cached_until_tools_change(self):
+        """Test that tool descriptions are built once and rebuilt on registration."""
+        manager = ADKAgentManager(api_key="test_key")
+        
+        def first_tool() -> ToolResult:
+            """Do the first thing."""
+        
+        def second_tool() -> ToolResult:
+            """Do the second thing."""
+        
+        manager.register_toolbox([first_tool])
+        descriptions = manager._generate_tool_descriptions()
+        
+        assert descriptions == "- first_tool: Do the first thing."
+        assert manager._generate_tool_descriptions() is descriptions
+        
+        manager.register_toolbox([second_tool])
+        
+        assert manager._generate_tool_descriptions() == (
+            "- first_tool: Do the first thing.\n- second_tool: Do the second thing."
+        )
+    
+    def test_system_prompt_prefix_follows_registered_tools(self):
+        """Test that the cached prompt prefix is rebuilt when tools are registered."""
+        manager = ADKAgentManager(api_key="test_key")
+        
+        def first_tool() -> ToolResult:
+            """Do the first thing."""
+        
+        def second_tool() -> ToolResult:
+            """Do the second thing."""
+        
+        manager.register_toolbox([first_tool])
+        prefix = manager._generate_system_prompt_prefix()
+        
+        assert "- first_tool: Do the first thing." in prefix
+        assert manager._generate_system_prompt_prefix() is prefix
+        
+        manager.register_toolbox([second_tool])
+        
+        assert "- second_tool: Do the second thing." in manager._generate_system_prompt_prefix()
@@ -29,7 +29,8 @@ class TestConfig:
             "MAX_CACHE_SIZE": "50",
             "MAX_CONCURRENT_SESSIONS": "2",
             "REQUEST_QUEUE_SIZE": "20",
-            "WEBSOCKET_PING_INTERVAL": "60"
+            "WEBSOCKET_PING_INTERVAL": "60",
+            "PLAN_CACHE_FLUSH_INTERVAL": "2.5"
         }):
             config = Config()
             
@@ -45,6 +46,7 @@ class TestConfig:
             assert config.MAX_CONCURRENT_SESSIONS == 2
             assert config.REQUEST_QUEUE_SIZE == 20
             assert config.WEBSOCKET_PING_INTERVAL == 60
+            assert config.PLAN_CACHE_FLUSH_INTERVAL == 2.5
     
     def test_config_uses_defaults(self):
         """Test that configuration uses default values when env vars not set"""
@@ -62,6 +64,29 @@ class TestConfig:
             assert config.MAX_CONCURRENT_SESSIONS == 1
             assert config.REQUEST_QUEUE_SIZE == 10
             assert config.WEBSOCKET_PING_INTERVAL == 30
+            assert config.PLAN_CACHE_FLUSH_INTERVAL == 5.0
+            assert config.RELOAD is False
+            assert config.CORS_ORIGINS == ["*"]
+    
+    def test_config_enables_reload(self):
+        """Test that auto-reload is opt-in via RELOAD"""
+        with patch.dict(os.environ, {
+            "GOOGLE_ADK_API_KEY": "test_key",
+            "RELOAD": "true"
+        }):
+            config = Config()
+            
+            assert config.RELOAD is True
+    
+    def test_config_parses_cors_origins(self):
+        """Test that CORS_ORIGINS is split into a list of origins"""
+        with patch.dict(os.environ, {
+            "GOOGLE_ADK_API_KEY": "test_key",
+            "CORS_ORIGINS": "http://localhost:3000, http://127.0.0.1:3000"
+        }):
+            config = Config()
+            
+            assert config.CORS_ORIGINS == ["http://localhost:3000", "http://127.0.0.1:3000"]
     
     def test_config_validates_required_api_key(self):
         """Test that missing API key raises ConfigurationError"""
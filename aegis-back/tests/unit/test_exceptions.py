@@ -13,6 +13,7 @@ from src.exceptions import (
     ClientError,
     SessionNotFoundError,
     InvalidSessionStateError,
+    QueueFullError,
     SystemError,
     ADKAgentError,
     RPAToolError,
@@ -119,6 +120,14 @@ class TestClientErrors:
         assert "completed" in exc.message
         assert exc.context["current_state"] == "completed"
         assert exc.context["operation"] == "cancel"
+    
+    def test_queue_full_error(self):
+        """Test queue full error."""
+        exc = QueueFullError(queue_size=10)
+        assert isinstance(exc, ClientError)
+        assert "full" in exc.message
+        assert exc.context["queue_size"] == 10
+        assert exc.retry_after == 5
 
 
 class TestSystemErrors:
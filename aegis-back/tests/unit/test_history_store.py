@@ -7,6 +7,7 @@ Tests the persistent storage and retrieval of execution sessions.
 import pytest
 import tempfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
 from src.history_store import HistoryStore
@@ -258,3 +259,99 @@ class TestHistoryStore:
         
         retrieved = history_store.get_session_details(session.session_id)
         assert retrieved.completed_at is None
+    
+    def test_get_session_details_served_from_cache(self, history_store, sample_session, temp_history_dir):
+        """Test that repeated lookups are served from the in-memory cache."""
+        history_store.save_session(sample_session)
+        
+        first = history_store.get_session_details(sample_session.session_id)
+        
+        # Remove the file; a cached lookup must not touch the disk
+        (Path(temp_history_dir) / f"{sample_session.session_id}.json").unlink()
+        second = history_store.get_session_details(sample_session.session_id)
+        
+        assert second is first
+    
+    def test_save_session_invalidates_cached_details(self, history_store, sample_session):
+        """Test that saving a session replaces its cached copy."""
+        history_store.save_session(sample_session)
+        history_store.get_session_details(sample_session.session_id)
+        
+        updated = sample_session.model_copy(update={"status": "failed"})
+        history_store.save_session(updated)
+        
+        retrieved = history_store.get_session_details(sample_session.session_id)
+        assert retrieved.status == "failed"
+    
+    def test_details_cache_evicts_least_recently_used(self, temp_history_dir):
+        """Test that the details cache stays within its configured size."""
+        store = HistoryStore(history_dir=temp_history_dir, details_cache_size=2)
+        for i in range(3):
+            store.save_session(ExecutionSession(
+                session_id=f"session_{i}",
+                instruction=f"Task {i}",
+                status="completed",
+                subtasks=[],
+                created_at=datetime.now(timezone.utc),
+                updated_at=datetime.now(timezone.utc)
+            ))
+            store.get_session_details(f"session_{i}")
+        
+        assert list(store._details_cache) == ["session_1", "session_2"]
+    
+    def test_get_session_details_corrupted_file(self, history_store, temp_history_dir):
+        """Test that an unreadable session file is reported as missing."""
+        (Path(temp_history_dir) / "broken.json").write_text("{not json", encoding="utf-8")
+        
+        assert history_store.get_session_details("broken") is None
+    
+    def test_get_cached_session_details_does_not_read_disk(self, history_store, sample_session):
+        """Test that only sessions already parsed are returned from the cache."""
+        history_store.save_session(sample_session)
+        
+        assert history_store.get_cached_session_details(sample_session.session_id) is None
+        
+        history_store.get_session_details(sample_session.session_id)
+        cached = history_store.get_cached_session_details(sample_session.session_id)
+        assert cached.session_id == sample_session.session_id
+    
+    def test_concurrent_saves_keep_index_consistent(self, history_store):
+        """Test that saves from several threads all land in the index."""
+        sessions = [
+            ExecutionSession(
+                session_id=f"session_{i}",
+                instruction=f"Task {i}",
+                status="completed",
+                subtasks=[],
+                created_at=datetime.now(timezone.utc),
+                updated_at=datetime.now(timezone.utc)
+            )
+            for i in range(20)
+        ]
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(history_store.save_session, sessions))
+        
+        assert len(history_store.get_all_sessions()) == 20
+    
+    def test_save_session_increments_version(self, history_store, sample_session):
+        """Test that every save bumps the store version."""
+        assert history_store.version == 0
+        
+        history_store.save_session(sample_session)
+        history_store.save_session(sample_session)
+        
+        assert history_store.version == 2
+    
+    def test_get_all_sessions_cached_until_next_save(self, history_store, sample_session, temp_history_dir):
+        """Test that listings are served from memory until a save invalidates them."""
+        history_store.save_session(sample_session)
+        assert len(history_store.get_all_sessions()) == 1
+        
+        # A cached listing must not re-read the index
+        (Path(temp_history_dir) / "index.json").write_text("[]")
+        assert len(history_store.get_all_sessions()) == 1
+        
+        # Saving rebuilds the index and invalidates the cached listing
+        history_store.save_session(sample_session.model_copy(update={"session_id": "session_2"}))
+        assert [s.session_id for s in history_store.get_all_sessions()] == ["session_2"]
@@ -6,6 +6,7 @@ Validates: Requirements 6.1, 6.2, 6.3, 8.1
 
 import pytest
 import logging
+from unittest.mock import MagicMock, patch
 from src.logging_utils import (
     SessionContextFilter,
     SessionLogger,
@@ -101,6 +102,32 @@ class TestSessionLogger:
         assert hasattr(caplog.records[0], 'extra_data')
         assert caplog.records[0].extra_data == {"key": "value"}
     
+    def test_logger_formats_args_lazily(self, caplog):
+        """Test %-style arguments are merged only when the record is emitted."""
+        logger = logging.getLogger("test_logger")
+        session_logger = SessionLogger(logger)
+        argument = MagicMock()
+        
+        with caplog.at_level(logging.INFO):
+            session_logger.debug("Skipped %s", argument, session_id="session123")
+            session_logger.info("Processed %s items", 3, session_id="session123")
+        
+        argument.__str__.assert_not_called()
+        assert len(caplog.records) == 1
+        assert caplog.records[0].getMessage() == "Processed 3 items"
+    
+    def test_logger_skips_context_for_disabled_level(self, caplog):
+        """Test that a filtered-out record leaves the session context untouched."""
+        logger = logging.getLogger("test_logger")
+        session_logger = SessionLogger(logger)
+        
+        with caplog.at_level(logging.INFO), \
+                patch("src.logging_utils.current_session_id") as context:
+            session_logger.debug("Skipped", session_id="session123")
+        
+        context.set.assert_not_called()
+        assert len(caplog.records) == 0
+    
     def test_logger_error_with_exc_info(self, caplog):
         """Test error logging with exception info."""
         logger = logging.getLogger("test_logger")
@@ -596,6 +596,38 @@ class TestExecutionPlan:
         json_data = plan.model_dump()
         assert json_data["instruction"] == "Test"
 
+    def test_from_session_keeps_tool_calls(self):
+        """Test building a replayable plan from an executed session."""
+        now = datetime.now()
+        session = ExecutionSession(
+            session_id="session_1",
+            instruction="Open notepad",
+            status="completed",
+            subtasks=[
+                Subtask(
+                    id="session_1_subtask_1",
+                    description="Launch notepad",
+                    status=SubtaskStatus.COMPLETED,
+                    tool_name="launch_application",
+                    tool_args={"app_name": "notepad"},
+                    result={"pid": 1234},
+                    timestamp=now
+                )
+            ],
+            created_at=now,
+            updated_at=now
+        )
+        plan = ExecutionPlan.from_session(session)
+        assert plan.instruction == "Open notepad"
+        assert plan.subtasks == [
+            {
+                "tool_name": "launch_application",
+                "tool_args": {"app_name": "notepad"},
+                "description": "Launch notepad"
+            }
+        ]
+        assert plan.estimated_duration is None
+
 
 class TestToolResult:
     """Tests for ToolResult model."""
@@ -219,6 +219,15 @@ class TestADKAgentMultiApp:
         assert "word" in apps
         assert len(apps) == 2
     
+    def test_identify_applications_in_order_of_mention(self):
+        """Test that each app is listed once, in the order it is first mentioned."""
+        agent = ADKAgentManager(api_key='test-key')
+        
+        instruction = "Open the spreadsheet in Excel, then email it from Google Chrome and Outlook"
+        apps = agent._identify_applications(instruction)
+        
+        assert apps == ["excel", "outlook", "chrome"]
+    
     def test_update_active_application(self):
         """Test updating active application context."""
         agent = ADKAgentManager(api_key='test-key')
@@ -0,0 +1,110 @@
+"""
+Unit tests for Plan Cache.
+
+Tests plan storage, similarity lookup, key normalization and
+thread-safe access.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from src.models import ExecutionPlan
+from src.plan_cache import PlanCache
+
+
+def make_plan(instruction: str) -> ExecutionPlan:
+    """Build a minimal execution plan for an instruction."""
+    return ExecutionPlan(
+        instruction=instruction,
+        subtasks=[{"tool_name": "type_text", "tool_args": {"text": "hi"}, "description": "type"}],
+        created_at=datetime.now()
+    )
+
+
+class TestPlanCache:
+    """Test suite for Plan Cache."""
+
+    def test_store_and_get_cached_plan(self, tmp_path):
+        """Test that a stored plan is returned for the same instruction."""
+        cache = PlanCache(cache_dir=tmp_path, max_size=10)
+        plan = make_plan("open notepad and type hello")
+
+        cache.store_plan("open notepad and type hello", plan)
+
+        assert cache.get_cached_plan("open notepad and type hello") == plan
+
+    def test_get_cached_plan_miss(self, tmp_path):
+        """Test that an unrelated instruction misses the cache."""
+        cache = PlanCache(cache_dir=tmp_path, max_size=10)
+        cache.store_plan("open notepad and type hello", make_plan("open notepad and type hello"))
+
+        assert cache.get_cached_plan("take a screenshot of the browser") is None
+
+    def test_cache_key_is_normalized(self, tmp_path):
+        """Test that case and whitespace differences share one cache entry."""
+        cache = PlanCache(cache_dir=tmp_path, max_size=10)
+
+        cache.store_plan("Open Notepad", make_plan("Open Notepad"))
+        cache.store_plan("  open   notepad ", make_plan("open notepad"))
+
+        assert len(cache._cache) == 1
+        assert cache.get_cached_plan("OPEN NOTEPAD") is not None
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used plan is evicted when full."""
+        cache = PlanCache(cache_dir=tmp_path, max_size=2)
+
+        cache.store_plan("open notepad", make_plan("open notepad"))
+        cache.store_plan("launch calculator app", make_plan("launch calculator app"))
+        cache.store_plan("take a screenshot now", make_plan("take a screenshot now"))
+
+        assert len(cache._cache) == 2
+        assert cache.get_cached_plan("open notepad") is None
+
+    def test_concurrent_access_from_threads(self, tmp_path):
+        """Test that lookups and stores from worker threads do not race."""
+        cache = PlanCache(cache_dir=tmp_path, max_size=5)
+        instructions = [f"instruction number {i}" for i in range(20)]
+
+        def store_and_get(instruction: str):
+            cache.store_plan(instruction, make_plan(instruction))
+            cache.get_cached_plan(instruction)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(store_and_get, instructions))
+
+        assert len(cache._cache) == 5
+
+    def test_store_plan_is_written_on_flush(self, tmp_path):
+        """Test that stored plans reach disk on flush and survive a reload."""
+        cache = PlanCache(cache_dir=tmp_path, max_size=10)
+        cache.store_plan("open notepad", make_plan("open notepad"))
+
+        # Storing only marks the cache dirty
+        assert not (tmp_path / "plan_cache.json").exists()
+
+        assert cache.flush() is True
+        assert cache.flush() is False
+
+        reloaded = PlanCache(cache_dir=tmp_path, max_size=10)
+        assert reloaded.get_cached_plan("open notepad") is not None
+
+    @pytest.mark.asyncio
+    async def test_flusher_survives_a_failed_write(self, tmp_path):
+        """Test that a failed flush is logged and retried on the next interval."""
+        cache = PlanCache(cache_dir=tmp_path, max_size=10)
+        cache.store_plan("open notepad", make_plan("open notepad"))
+
+        with patch.object(cache, "_save_cache", side_effect=[OSError("disk full"), None]) as save:
+            flusher = asyncio.create_task(cache.run_flusher(0.01))
+            while save.call_count < 2:
+                await asyncio.sleep(0.01)
+
+            assert not flusher.done()
+            flusher.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await flusher
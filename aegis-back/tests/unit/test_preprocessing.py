@@ -0,0 +1,57 @@
+"""
+Unit tests for Pre-Processing Layer.
+
+Tests instruction validation and sanitization.
+"""
+
+from src.preprocessing import PreProcessor
+
+
+class TestPreProcessor:
+    """Test suite for PreProcessor."""
+
+    def test_sanitize_collapses_whitespace(self):
+        """Test that line breaks, tabs and repeated spaces become one space."""
+        preprocessor = PreProcessor()
+
+        assert preprocessor.sanitize_instruction("  Open\nnotepad\tand\r\n  type  ") == "Open notepad and type"
+
+    def test_sanitize_replaces_control_characters(self):
+        """Test that non-printable characters are replaced with spaces."""
+        preprocessor = PreProcessor()
+
+        assert preprocessor.sanitize_instruction("Open\x00notepad\x1b") == "Open notepad"
+
+    def test_sanitize_keeps_printable_unicode(self):
+        """Test that printable non-ASCII text passes through unchanged."""
+        preprocessor = PreProcessor()
+
+        assert preprocessor.sanitize_instruction("Öffne Notepad 漢字") == "Öffne Notepad 漢字"
+
+    def test_validate_and_sanitize_accepts_instruction(self):
+        """Test that a valid instruction is returned sanitized."""
+        preprocessor = PreProcessor()
+
+        result, sanitized = preprocessor.validate_and_sanitize("  Open   notepad ")
+
+        assert result.is_valid
+        assert sanitized == "Open notepad"
+
+    def test_validate_and_sanitize_rejects_symbols_only(self):
+        """Test that an instruction without alphanumerics is rejected."""
+        preprocessor = PreProcessor()
+
+        result, sanitized = preprocessor.validate_and_sanitize("!!! ???")
+
+        assert not result.is_valid
+        assert "alphanumeric" in result.error_message
+        assert sanitized is None
+
+    def test_validate_and_sanitize_rejects_whitespace_only(self):
+        """Test that control characters and whitespace alone are rejected."""
+        preprocessor = PreProcessor()
+
+        result, sanitized = preprocessor.validate_and_sanitize("\x00\n\t ")
+
+        assert not result.is_valid
+        assert sanitized is None
@@ -49,6 +49,16 @@ class TestResourceManager:
         result = rm.unregister_resource("file", "nonexistent.txt")
         assert result is False
     
+    def test_reset_rebinds_session(self):
+        """Test that reset() rebinds the manager to a new, empty session."""
+        rm = ResourceManager("session123")
+        rm.register_resource("file", "test.txt", lambda: None)
+        
+        rm.reset("session456")
+        
+        assert rm.session_id == "session456"
+        assert rm.resources == []
+    
     @pytest.mark.asyncio
     async def test_cleanup_all_sync_resources(self):
         """Test cleaning up synchronous resources."""
@@ -72,6 +72,17 @@ class TestSessionManager:
         session = manager.get_session(session_id)
         assert session.status == "in_progress"
     
+    def test_update_session_mutates_session_in_place(self):
+        """Test that updates are visible through a previously fetched reference."""
+        manager = SessionManager()
+        session_id = manager.create_session("Test task")
+        session = manager.get_session(session_id)
+        
+        manager.update_session(session_id, SessionUpdate(status="completed"))
+        
+        assert session.status == "completed"
+        assert manager.get_session(session_id) is session
+    
     def test_update_session_adds_subtask(self):
         """Test adding a subtask to session."""
         manager = SessionManager()
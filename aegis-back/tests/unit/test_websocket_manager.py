@@ -5,9 +5,11 @@ Tests WebSocket connection management, message broadcasting,
 and window state commands.
 """
 
+import asyncio
+import json
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from datetime import datetime
+from datetime import datetime, timedelta
 from src.websocket_manager import WebSocketManager
 from src.models import StatusUpdate, Subtask, SubtaskStatus
 
@@ -84,11 +86,43 @@ class TestWebSocketManager:
         )
         
         await manager.broadcast_update(session_id, update)
+        await manager.flush(session_id)
         
         # Verify both websockets received the message
         websocket1.send_text.assert_called_once()
         websocket2.send_text.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_broadcast_update_serializes_once(self):
+        """Test that broadcast_update() encodes an update once for all clients."""
+        manager = WebSocketManager()
+        websockets = [AsyncMock() for _ in range(3)]
+        session_id = "test-session-123"
+        
+        for websocket in websockets:
+            await manager.connect(websocket, session_id)
+        
+        update = StatusUpdate(
+            session_id=session_id,
+            subtask=None,
+            overall_status="in_progress",
+            message="Test message",
+            timestamp=datetime.now()
+        )
+        
+        with patch.object(
+            StatusUpdate, "model_dump_json", autospec=True, side_effect=StatusUpdate.model_dump_json
+        ) as dump:
+            await manager.broadcast_update(session_id, update)
+        await manager.flush(session_id)
+        
+        dump.assert_called_once()
+        
+        # Every client is handed the same string object
+        first = websockets[0].send_text.call_args[0][0]
+        for websocket in websockets[1:]:
+            assert websocket.send_text.call_args[0][0] is first
+    
     @pytest.mark.asyncio
     async def test_broadcast_update_with_window_state(self):
         """Test that broadcast_update() includes window_state field."""
@@ -109,6 +143,7 @@ class TestWebSocketManager:
         )
         
         await manager.broadcast_update(session_id, update)
+        await manager.flush(session_id)
         
         # Verify message was sent
         websocket.send_text.assert_called_once()
@@ -118,6 +153,32 @@ class TestWebSocketManager:
         assert "window_state" in sent_message
         assert "minimal" in sent_message
     
+    @pytest.mark.asyncio
+    async def test_broadcast_update_omits_null_fields(self):
+        """Test that broadcast_update() leaves unset optional fields off the wire."""
+        manager = WebSocketManager()
+        websocket = AsyncMock()
+        session_id = "test-session-123"
+        
+        await manager.connect(websocket, session_id)
+        
+        update = StatusUpdate(
+            session_id=session_id,
+            subtask=None,
+            overall_status="in_progress",
+            message="Working",
+            window_state=None,
+            timestamp=datetime.now()
+        )
+        
+        await manager.broadcast_update(session_id, update)
+        await manager.flush(session_id)
+        
+        sent = json.loads(websocket.send_text.call_args[0][0])
+        assert "subtask" not in sent
+        assert "window_state" not in sent
+        assert sent["message"] == "Working"
+    
     @pytest.mark.asyncio
     async def test_send_window_state_minimal(self):
         """Test send_window_state() with 'minimal' state."""
@@ -127,6 +188,7 @@ class TestWebSocketManager:
         
         await manager.connect(websocket, session_id)
         await manager.send_window_state(session_id, "minimal")
+        await manager.flush(session_id)
         
         # Verify message was sent
         websocket.send_text.assert_called_once()
@@ -135,6 +197,10 @@ class TestWebSocketManager:
         sent_message = websocket.send_text.call_args[0][0]
         assert "window_state" in sent_message
         assert "minimal" in sent_message
+        
+        # Timestamps carry an explicit UTC offset
+        timestamp = datetime.fromisoformat(json.loads(sent_message)["timestamp"].replace("Z", "+00:00"))
+        assert timestamp.utcoffset() == timedelta(0)
     
     @pytest.mark.asyncio
     async def test_send_window_state_normal(self):
@@ -145,6 +211,7 @@ class TestWebSocketManager:
         
         await manager.connect(websocket, session_id)
         await manager.send_window_state(session_id, "normal")
+        await manager.flush(session_id)
         
         # Verify message was sent
         websocket.send_text.assert_called_once()
@@ -174,6 +241,55 @@ class TestWebSocketManager:
         # Verify connections were removed
         assert not manager.has_connections(session_id)
     
+    @pytest.mark.asyncio
+    async def test_close_all_connections_does_not_wait_on_stuck_socket(self):
+        """Test that a socket that never closes cannot stall close_all_connections()."""
+        manager = WebSocketManager()
+        stuck = AsyncMock()
+        healthy = AsyncMock()
+        
+        async def never_close():
+            await asyncio.Event().wait()
+        
+        stuck.close.side_effect = never_close
+        session_id = "test-session-123"
+        
+        await manager.connect(stuck, session_id)
+        await manager.connect(healthy, session_id)
+        
+        await asyncio.wait_for(
+            manager.close_all_connections(session_id, timeout=0.05), timeout=1.0
+        )
+        
+        healthy.close.assert_called_once()
+        assert not manager.has_connections(session_id)
+    
+    @pytest.mark.asyncio
+    async def test_close_all_closes_every_session(self):
+        """Test that close_all() closes connections across all sessions."""
+        manager = WebSocketManager()
+        websocket1 = AsyncMock()
+        websocket2 = AsyncMock()
+        
+        await manager.connect(websocket1, "session-a")
+        await manager.connect(websocket2, "session-b")
+        
+        await manager.close_all()
+        
+        websocket1.close.assert_called_once()
+        websocket2.close.assert_called_once()
+        assert manager.get_active_sessions() == []
+    
+    @pytest.mark.asyncio
+    async def test_get_active_sessions_lists_connected_sessions(self):
+        """Test that get_active_sessions() returns sessions with open connections."""
+        manager = WebSocketManager()
+        
+        await manager.connect(AsyncMock(), "session-a")
+        await manager.connect(AsyncMock(), "session-b")
+        
+        assert sorted(manager.get_active_sessions()) == ["session-a", "session-b"]
+    
     @pytest.mark.asyncio
     async def test_broadcast_to_nonexistent_session(self):
         """Test that broadcasting to a session with no connections doesn't error."""
@@ -192,6 +308,255 @@ class TestWebSocketManager:
         # Should not raise an exception
         await manager.broadcast_update(session_id, update)
     
+    @pytest.mark.asyncio
+    async def test_late_connection_receives_recent_updates(self):
+        """Test that updates broadcast before a client connects are replayed to it."""
+        manager = WebSocketManager(replay_size=2)
+        websocket = AsyncMock()
+        session_id = "test-session-123"
+        
+        with patch.object(
+            StatusUpdate, "model_dump_json", autospec=True, side_effect=StatusUpdate.model_dump_json
+        ) as dump:
+            for i in range(3):
+                await manager.broadcast_update(session_id, StatusUpdate(
+                    session_id=session_id,
+                    subtask=None,
+                    overall_status="in_progress",
+                    message=f"Update {i}",
+                    timestamp=datetime.now()
+                ))
+        
+            # Each update is serialized once, as it is broadcast
+            assert dump.call_count == 3
+            
+            await manager.connect(websocket, session_id)
+            await manager.flush(session_id)
+        
+        # Replay reuses the stored messages
+        assert dump.call_count == 3
+        
+        sent = json.loads(websocket.send_text.call_args[0][0])
+        assert [update["message"] for update in sent] == ["Update 1", "Update 2"]
+    
+    @pytest.mark.asyncio
+    async def test_replayed_update_keeps_state_at_broadcast(self):
+        """Test that later in-place subtask changes do not alter replayed updates."""
+        manager = WebSocketManager()
+        websocket = AsyncMock()
+        session_id = "test-session-123"
+        
+        subtask = Subtask(
+            id="st_1",
+            description="Type text",
+            status=SubtaskStatus.IN_PROGRESS,
+            timestamp=datetime.now()
+        )
+        await manager.broadcast_update(session_id, StatusUpdate(
+            session_id=session_id,
+            subtask=subtask,
+            overall_status="in_progress",
+            message="Starting subtask",
+            timestamp=datetime.now()
+        ))
+        subtask.status = SubtaskStatus.COMPLETED
+        
+        await manager.connect(websocket, session_id)
+        await manager.flush(session_id)
+        
+        sent = json.loads(websocket.send_text.call_args[0][0])
+        assert sent["subtask"]["status"] == "in_progress"
+    
+    @pytest.mark.asyncio
+    async def test_broadcast_does_not_wait_for_slow_client(self):
+        """Test that broadcast_update() returns before a slow client's send completes."""
+        manager = WebSocketManager()
+        websocket = AsyncMock()
+        release = asyncio.Event()
+        
+        async def slow_send(_):
+            await release.wait()
+        
+        websocket.send_text.side_effect = slow_send
+        session_id = "test-session-123"
+        
+        await manager.connect(websocket, session_id)
+        await asyncio.wait_for(
+            manager.send_window_state(session_id, "minimal"), timeout=1.0
+        )
+        
+        release.set()
+        await manager.flush(session_id)
+        websocket.send_text.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_oldest_update(self):
+        """Test that a full outbound queue drops its oldest message."""
+        manager = WebSocketManager(queue_size=2)
+        websocket = AsyncMock()
+        session_id = "test-session-123"
+        
+        await manager.connect(websocket, session_id)
+        
+        # Broadcast without yielding so the relay cannot drain in between
+        for i in range(3):
+            await manager.broadcast_update(session_id, StatusUpdate(
+                session_id=session_id,
+                subtask=None,
+                overall_status="in_progress",
+                message=f"Update {i}",
+                window_state=None,
+                timestamp=datetime.now()
+            ))
+        await manager.flush(session_id)
+        
+        # The two surviving updates are coalesced into one array frame
+        websocket.send_text.assert_called_once()
+        sent = json.loads(websocket.send_text.call_args[0][0])
+        assert [update["message"] for update in sent] == ["Update 1", "Update 2"]
+    
+    @pytest.mark.asyncio
+    async def test_updates_within_window_sent_as_one_frame(self):
+        """Test that updates arriving within the batch window share a frame."""
+        manager = WebSocketManager(batch_window=0.05)
+        websocket = AsyncMock()
+        session_id = "test-session-123"
+        
+        await manager.connect(websocket, session_id)
+        await manager.send_window_state(session_id, "minimal")
+        await asyncio.sleep(0.01)
+        await manager.send_window_state(session_id, "normal")
+        await manager.flush(session_id)
+        
+        websocket.send_text.assert_called_once()
+        sent = json.loads(websocket.send_text.call_args[0][0])
+        assert [update["window_state"] for update in sent] == ["minimal", "normal"]
+    
+    @pytest.mark.asyncio
+    async def test_batch_keeps_latest_update_per_subtask(self):
+        """Test that a later update for a subtask replaces the earlier one in a frame."""
+        manager = WebSocketManager(batch_window=0.05)
+        websocket = AsyncMock()
+        session_id = "test-session-123"
+        
+        await manager.connect(websocket, session_id)
+        
+        def subtask_update(subtask_id: str, status: SubtaskStatus) -> StatusUpdate:
+            return StatusUpdate(
+                session_id=session_id,
+                subtask=Subtask(
+                    id=subtask_id,
+                    description="Type text",
+                    status=status,
+                    timestamp=datetime.now()
+                ),
+                overall_status="in_progress",
+                message=f"{subtask_id} {status.value}",
+                timestamp=datetime.now()
+            )
+        
+        await manager.broadcast_update(session_id, subtask_update("st_1", SubtaskStatus.IN_PROGRESS))
+        await manager.broadcast_update(session_id, subtask_update("st_1", SubtaskStatus.COMPLETED))
+        await manager.broadcast_update(session_id, subtask_update("st_2", SubtaskStatus.IN_PROGRESS))
+        await manager.flush(session_id)
+        
+        websocket.send_text.assert_called_once()
+        sent = json.loads(websocket.send_text.call_args[0][0])
+        assert [update["message"] for update in sent] == ["st_1 completed", "st_2 in_progress"]
+    
+    @pytest.mark.asyncio
+    async def test_batch_keeps_window_command_of_superseded_update(self):
+        """Test that a subtask start carrying a window command survives its completion."""
+        manager = WebSocketManager(batch_window=0.05)
+        websocket = AsyncMock()
+        session_id = "test-session-123"
+        
+        await manager.connect(websocket, session_id)
+        
+        subtask = Subtask(
+            id="st_1",
+            description="Type text",
+            status=SubtaskStatus.IN_PROGRESS,
+            timestamp=datetime.now()
+        )
+        await manager.broadcast_update(session_id, StatusUpdate(
+            session_id=session_id,
+            subtask=subtask,
+            overall_status="in_progress",
+            message="Starting subtask",
+            window_state="minimal",
+            timestamp=datetime.now()
+        ))
+        await manager.broadcast_update(session_id, StatusUpdate(
+            session_id=session_id,
+            subtask=subtask.model_copy(update={"status": SubtaskStatus.COMPLETED}),
+            overall_status="in_progress",
+            message="Completed subtask",
+            timestamp=datetime.now()
+        ))
+        await manager.flush(session_id)
+        
+        websocket.send_text.assert_called_once()
+        sent = json.loads(websocket.send_text.call_args[0][0])
+        assert [update["message"] for update in sent] == ["Starting subtask", "Completed subtask"]
+        assert sent[0]["window_state"] == "minimal"
+    
+    @pytest.mark.asyncio
+    async def test_batch_is_capped_at_max_items(self):
+        """Test that a frame holds at most batch_max_items messages."""
+        manager = WebSocketManager(batch_window=10.0, batch_max_items=2)
+        websocket = AsyncMock()
+        session_id = "test-session-123"
+        
+        await manager.connect(websocket, session_id)
+        for i in range(4):
+            await manager.broadcast_update(session_id, StatusUpdate(
+                session_id=session_id,
+                subtask=None,
+                overall_status="in_progress",
+                message=f"Update {i}",
+                timestamp=datetime.now()
+            ))
+        await asyncio.wait_for(manager.flush(session_id), timeout=1.0)
+        
+        assert websocket.send_text.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_terminal_update_sent_without_batch_delay(self):
+        """Test that a terminal update is not held back by the batch window."""
+        manager = WebSocketManager(batch_window=10.0)
+        websocket = AsyncMock()
+        session_id = "test-session-123"
+        
+        await manager.connect(websocket, session_id)
+        await manager.broadcast_update(session_id, StatusUpdate(
+            session_id=session_id,
+            subtask=None,
+            overall_status="completed",
+            message="Done",
+            window_state="normal",
+            timestamp=datetime.now()
+        ))
+        await asyncio.wait_for(manager.flush(session_id), timeout=1.0)
+        
+        sent = json.loads(websocket.send_text.call_args[0][0])
+        assert sent["overall_status"] == "completed"
+    
+    @pytest.mark.asyncio
+    async def test_failed_send_removes_connection(self):
+        """Test that a client whose send fails is unregistered by its relay."""
+        manager = WebSocketManager()
+        websocket = AsyncMock()
+        websocket.send_text.side_effect = RuntimeError("connection reset")
+        session_id = "test-session-123"
+        
+        await manager.connect(websocket, session_id)
+        await manager.send_window_state(session_id, "normal")
+        await manager.flush(session_id)
+        await asyncio.sleep(0)
+        
+        assert not manager.has_connections(session_id)
+    
     @pytest.mark.asyncio
     async def test_has_connections_returns_false_for_new_session(self):
         """Test that has_connections() returns False for sessions with no connections."""
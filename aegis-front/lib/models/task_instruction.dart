@@ -20,10 +20,14 @@ class TaskInstructionResponse {
   final String status;
   final String message;
 
+  /// Number of sessions queued ahead of and including this one
+  final int? queuePosition;
+
   TaskInstructionResponse({
     required this.sessionId,
     required this.status,
     required this.message,
+    this.queuePosition,
   });
 
   /// Create TaskInstructionResponse from JSON with error handling
@@ -33,6 +37,7 @@ class TaskInstructionResponse {
         sessionId: JsonParser.parseString(json, 'session_id'),
         status: JsonParser.parseString(json, 'status'),
         message: JsonParser.parseString(json, 'message'),
+        queuePosition: JsonParser.parseOptionalInt(json, 'queue_position'),
       );
     } catch (e) {
       throw ParsingException(
@@ -48,6 +53,7 @@ class TaskInstructionResponse {
       'session_id': sessionId,
       'status': status,
       'message': message,
+      'queue_position': queuePosition,
     };
   }
 }
@@ -1,6 +1,7 @@
 import 'dart:async';
 import 'dart:convert';
 import 'dart:developer' as developer;
+import 'package:flutter/foundation.dart';
 import 'package:web_socket_channel/web_socket_channel.dart';
 import '../models/status_update.dart';
 import '../config/app_config.dart';
@@ -157,20 +158,25 @@ class WebSocketService {
   void _handleMessage(dynamic message) {
     try {
       // Parse JSON message
-      final Map<String, dynamic> json = jsonDecode(message as String);
+      final decoded = jsonDecode(message as String);
       
       // DEBUG: Log the raw message
-      print('WebSocket received: $json');
+      print('WebSocket received: $decoded');
       
-      // Deserialize to StatusUpdate
-      final update = StatusUpdate.fromJson(json);
+      // The backend coalesces bursts of updates into a JSON array
+      final List<dynamic> items = decoded is List ? decoded : [decoded];
       
-      // DEBUG: Log parsed update
-      print('Parsed StatusUpdate - subtask: ${update.subtask?.id}, status: ${update.overallStatus}');
-      
-      // Invoke callback
-      if (_onUpdate != null) {
-        _onUpdate!(update);
+      for (final item in items) {
+        // Deserialize to StatusUpdate
+        final update = StatusUpdate.fromJson(item as Map<String, dynamic>);
+        
+        // DEBUG: Log parsed update
+        print('Parsed StatusUpdate - subtask: ${update.subtask?.id}, status: ${update.overallStatus}');
+        
+        // Invoke callback
+        if (_onUpdate != null) {
+          _onUpdate!(update);
+        }
       }
     } on FormatException catch (e) {
       // Invalid JSON format
@@ -208,6 +214,16 @@ class WebSocketService {
     }
   }
 
+  /// Feed a raw frame through the message handler (testing only)
+  @visibleForTesting
+  void handleMessageForTesting(
+    dynamic message, {
+    required Function(StatusUpdate) onUpdate,
+  }) {
+    _onUpdate = onUpdate;
+    _handleMessage(message);
+  }
+
   /// Handle WebSocket errors
   void _handleError(dynamic error) {
     print('WebSocket error: $error');
@@ -104,6 +104,40 @@ void main() {
         expect(update.windowState, 'minimal');
       });
 
+      test('dispatches each item of a batched array frame in order', () {
+        // Arrange
+        final timestamp = DateTime.now();
+        
+        final batchedMessage = jsonEncode([
+          {
+            'session_id': 'test-session-123',
+            'overall_status': 'in_progress',
+            'message': 'Minimizing window',
+            'window_state': 'minimal',
+            'timestamp': timestamp.toIso8601String(),
+          },
+          {
+            'session_id': 'test-session-123',
+            'overall_status': 'in_progress',
+            'message': 'Executing task',
+            'timestamp': timestamp.toIso8601String(),
+          },
+        ]);
+
+        // Act
+        final updates = <StatusUpdate>[];
+        service.handleMessageForTesting(
+          batchedMessage,
+          onUpdate: updates.add,
+        );
+
+        // Assert
+        expect(updates.length, 2);
+        expect(updates[0].message, 'Minimizing window');
+        expect(updates[0].windowState, 'minimal');
+        expect(updates[1].message, 'Executing task');
+      });
+
       test('throws on malformed JSON', () {
         // Arrange
         final malformedJson = 'invalid json {{{';